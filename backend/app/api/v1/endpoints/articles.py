@@ -1,17 +1,77 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, Query
+import base64
+from urllib.parse import unquote
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import RedirectResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import or_, and_
 from app.db.session import get_db
 from app.models.article import Article
+from app.schemas.article import ArticleDetail
+from app.api.v1.pagination import (
+    encode_cursor, encode_rank_cursor, decode_rank_cursor, feed_order, after_cursor, after_rank_cursor, fetch_page
+)
+from app.api.v1.responses import card_query, serialize_article, serialize_articles, etag_json_response
+from app.services import search as search_index
+from app.services.categories import category_filter_slug
+from app.services.search_engine import memory_search
+from app.services.view_counter import view_counter
+
+# Upper bound on ranked hits the in-process index hands back per query
+MEMORY_SEARCH_MAX_HITS = 1000
+# Delta batches (SYNC_BATCH_SIZE rows each) one query may index; the bulk is indexed at startup
+REQUEST_SYNC_BATCHES = 1
+# Largest value of the INTEGER primary key (Postgres int4)
+MAX_ARTICLE_ID = 2 ** 31 - 1
 
 router = APIRouter()
 
+def _ilike_search(term: str):
+    search_term = f"%{term.strip()}%"
+    return or_(
+        Article.title.ilike(search_term),
+        Article.summary.ilike(search_term),
+        Article.content.ilike(search_term),
+        Article.author.ilike(search_term)
+    )
+
+def _search_in_memory(db: Session, q: str, category: Optional[str], limit: int, offset: int, cursor: Optional[str]):
+    """Relevance search against the in-process BM25 index (Lite Mode)."""
+    # Warmed at startup; a request only picks up rows other processes added since
+    memory_search.sync(db, max_batches=REQUEST_SYNC_BATCHES)
+    # Scores are negated into ranks so cursors share the database backend's format
+    hits = [(-score, article_id) for article_id, score in memory_search.search(q, MEMORY_SEARCH_MAX_HITS)]
+    
+    if category and hits:
+        allowed = {
+            article_id for (article_id,) in db.query(Article.id).filter(
+                Article.id.in_([article_id for _, article_id in hits]),
+                Article.category_slug == category_filter_slug(category)
+            )
+        }
+        hits = [hit for hit in hits if hit[1] in allowed]
+    total_count = len(hits)
+    
+    if cursor:
+        after = decode_rank_cursor(cursor)
+        hits = [(rank, article_id) for rank, article_id in hits if (rank, -article_id) > (after[0], -after[1])]
+    else:
+        hits = hits[offset:]
+    page, has_more = hits[:limit], len(hits) > limit
+    
+    by_id = {a.id: a for a in card_query(db).filter(Article.id.in_([article_id for _, article_id in page]))}
+    results = [by_id[article_id] for _, article_id in page if article_id in by_id]
+    next_cursor = encode_rank_cursor(*page[-1]) if has_more else None
+    return results, total_count, has_more, next_cursor
+
 @router.get("/")
 def get_articles(
+    request: Request,
     db: Session = Depends(get_db), 
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     category: Optional[str] = None,
     search: Optional[str] = None,
     source: Optional[str] = None
@@ -22,7 +82,9 @@ def get_articles(
     Parameters:
     - limit: Number of articles to return (default: 50, max: 100)
     - offset: Number of articles to skip for pagination (default: 0)
-    - category: Filter by category (fuzzy match)
+    - cursor: Opaque `next_cursor` from a previous page; takes precedence over offset
+    - include_total: Also run an exact COUNT(*) for `total` (default: off, `total` is null)
+    - category: Filter by category name, alias or slug (e.g. "Business", "ai-startups")
     - search: Search in title, content, and author (case-insensitive)
     - source: Filter by source name
     
@@ -31,90 +93,155 @@ def get_articles(
     # Limit maximum to prevent abuse
     limit = min(limit, 100)
     
-    query = db.query(Article)
+    query = card_query(db)
     
     # Category filter
     if category and category.lower() != "all":
-        query = query.filter(Article.category.ilike(f"%{category}%"))
+        query = query.filter(Article.category_slug == category_filter_slug(category))
     
     # Source filter
     if source:
         query = query.filter(Article.source.ilike(f"%{source}%"))
     
-    # Search functionality - searches across title, content, and author
+    # Search functionality - searches across title, content, and author.
+    # Uses the full-text index as a filter; the feed keeps its own ordering.
     if search and search.strip():
-        search_term = f"%{search.strip()}%"
-        query = query.filter(
-            or_(
-                Article.title.ilike(search_term),
-                Article.content.ilike(search_term),
-                Article.author.ilike(search_term),
-                Article.summary.ilike(search_term)
-            )
-        )
-    
-    # Get total count for pagination metadata
-    total_count = query.count()
-    
-    # Apply sorting and pagination
-    articles = query.order_by(
-        Article.feed_score.desc(), 
-        Article.publish_date.desc()
-    ).offset(offset).limit(limit).all()
-    
-    return {
-        "articles": articles,
+        matches = search_index.ranked_matches(db, search) if search_index.is_available(db) else None
+        if matches is not None:
+            query = query.join(matches, matches.c.id == Article.id)
+        else:
+            query = query.filter(_ilike_search(search))
+    
+    # Exact count only on request; has_more comes from the probe row
+    total_count = query.count() if include_total else None
+    
+    # Apply sorting and pagination (keyset when a cursor is given)
+    query = feed_order(query)
+    if cursor:
+        query = after_cursor(query, cursor, nulls_first=db.bind.dialect.name == "postgresql")
+    else:
+        query = query.offset(offset)
+    articles, has_more = fetch_page(query, limit)
+    
+    return etag_json_response(request, {
+        "articles": serialize_articles(articles),
         "total": total_count,
         "limit": limit,
         "offset": offset,
-        "has_more": (offset + limit) < total_count
-    }
+        "has_more": has_more,
+        "next_cursor": encode_cursor(articles[-1]) if has_more else None
+    })
 
 @router.get("/search")
 def search_articles(
+    request: Request,
     q: str = Query(..., min_length=2, description="Search query"),
     db: Session = Depends(get_db),
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     category: Optional[str] = None
 ):
     """
     Dedicated search endpoint with enhanced relevance scoring.
     
     Searches across title (highest weight), summary, content, and author.
-    Returns results ranked by relevance and recency.
+    Returns results ranked by full-text relevance (BM25 via FTS5 on SQLite,
+    ts_rank on Postgres, or the in-process BM25 index when the database has
+    no full-text support). `total` is only computed when `include_total` is
+    set, except on the in-process index where it comes for free.
     """
     limit = min(limit, 50)
-    search_term = f"%{q.strip()}%"
     
-    query = db.query(Article)
+    if search_index.use_memory_backend(db):
+        results, total_count, has_more, next_cursor = _search_in_memory(db, q, category, limit, offset, cursor)
+        return etag_json_response(request, {
+            "query": q,
+            "results": serialize_articles(results),
+            "total": total_count,
+            "limit": limit,
+            "offset": offset,
+            "has_more": has_more,
+            "next_cursor": next_cursor
+        })
+    
+    query = card_query(db)
     
     # Category filter if provided
     if category:
-        query = query.filter(Article.category.ilike(f"%{category}%"))
-    
-    # Multi-field search
-    query = query.filter(
-        or_(
-            Article.title.ilike(search_term),
-            Article.summary.ilike(search_term),
-            Article.content.ilike(search_term),
-            Article.author.ilike(search_term)
-        )
-    )
-    
-    total_count = query.count()
-    
-    # Prioritize title matches, then by quality score and date
-    results = query.order_by(
-        Article.feed_score.desc(),
-        Article.publish_date.desc()
-    ).offset(offset).limit(limit).all()
-    
-    return {
+        query = query.filter(Article.category_slug == category_filter_slug(category))
+    
+    matches = search_index.ranked_matches(db, q) if search_index.is_available(db) else None
+    if matches is None:
+        # No full-text index on this database: substring scan in feed order
+        query = query.filter(_ilike_search(q))
+        total_count = query.count() if include_total else None
+        query = feed_order(query)
+        if cursor:
+            query = after_cursor(query, cursor, nulls_first=db.bind.dialect.name == "postgresql")
+        else:
+            query = query.offset(offset)
+        results, has_more = fetch_page(query, limit)
+        next_cursor = encode_cursor(results[-1]) if has_more else None
+    else:
+        # Relevance order from the index (title matches weigh the most)
+        query = query.join(matches, matches.c.id == Article.id)
+        total_count = query.count() if include_total else None
+        query = query.add_columns(matches.c.rank).order_by(matches.c.rank, Article.id.desc())
+        if cursor:
+            query = after_rank_cursor(query, cursor, matches.c.rank)
+        else:
+            query = query.offset(offset)
+        rows, has_more = fetch_page(query, limit)
+        results = [article for article, _ in rows]
+        next_cursor = encode_rank_cursor(rows[-1][1], rows[-1][0].id) if has_more else None
+    
+    return etag_json_response(request, {
         "query": q,
-        "results": results,
+        "results": serialize_articles(results),
         "total": total_count,
         "limit": limit,
-        "offset": offset
-    }
+        "offset": offset,
+        "has_more": has_more,
+        "next_cursor": next_cursor
+    })
+
+@router.get("/{article_ref}")
+def get_article(article_ref: str, request: Request, db: Session = Depends(get_db)):
+    """
+    Full article including content, looked up by numeric id or slug.
+    
+    Each full fetch counts as a view (304 revalidations do not); the
+    increment is buffered and written in bulk by the view flusher rather
+    than on this request.
+    """
+    if article_ref.isascii() and article_ref.isdigit():
+        # Ids past the integer column's range can't exist, and would fail at the DB bind
+        article_id = int(article_ref)
+        article = db.query(Article).filter(Article.id == article_id).first() if article_id <= MAX_ARTICLE_ID else None
+    else:
+        article = db.query(Article).filter(Article.slug == article_ref).first()
+    if not article:
+        raise HTTPException(status_code=404, detail="Article not found")
+    response = etag_json_response(request, serialize_article(article, ArticleDetail))
+    if response.status_code != 304:
+        view_counter.record(article.id)
+    return response
+
+@router.get("/{article_id}/image")
+def get_article_image(article_id: int, db: Session = Depends(get_db)):
+    """
+    Serve an article's image. Generated placeholders are stored inline as
+    data: URIs; cards link here instead of embedding them.
+    """
+    image_url = db.query(Article.image_url).filter(Article.id == article_id).scalar()
+    if not image_url:
+        raise HTTPException(status_code=404, detail="Image not found")
+    if not image_url.startswith("data:"):
+        return RedirectResponse(image_url)
+    
+    header, _, data = image_url.partition(",")
+    media_type = header[5:].split(";")[0] or "application/octet-stream"
+    body = base64.b64decode(data) if header.endswith(";base64") else unquote(data).encode()
+    return Response(content=body, media_type=media_type, headers={"Cache-Control": "public, max-age=86400"})
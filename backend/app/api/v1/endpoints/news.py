@@ -1,10 +1,14 @@
-from fastapi import APIRouter, Depends, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, Query, BackgroundTasks, Request
 from sqlalchemy.orm import Session
+from app.api.v1.responses import card_query, serialize_articles, etag_json_response
+from app.core.cache import response_cache
 from app.db.session import get_db
 from app.models.article import Article
+from app.models.crawl import CrawlHost
+from app.services.categories import category_filter_slug
 from app.services.scraper_v2 import SCRAPER_CONFIG
-from app.services.pipeline_v2 import run_premium_source_scrape
-import asyncio
+from app.services.pipeline_v2 import scrape_sources
+from app.services.stages import pipeline_stats
 
 router = APIRouter()
 
@@ -13,65 +17,61 @@ async def trigger_scrape(background_tasks: BackgroundTasks):
     """
     Manually trigger the news scraper in the background.
     """
-    async def scrape_job():
-        for config in SCRAPER_CONFIG:
-            try:
-                print(f"Scraping {config['name']}...")
-                await asyncio.to_thread(run_premium_source_scrape, config)
-            except Exception as e:
-                print(f"Error scraping {config['name']}: {e}")
-
-    background_tasks.add_task(scrape_job)
+    background_tasks.add_task(scrape_sources, SCRAPER_CONFIG)
     return {"message": "Scraper started in background. Check back in 2 minutes!", "sources": len(SCRAPER_CONFIG)}
 
 def get_category_news(category: str, db: Session, limit: int = 50):
-    return db.query(Article).filter(
-        Article.category.ilike(f"%{category}%")
-    ).order_by(Article.publish_date.desc()).limit(limit).all()
+    """Served from the response cache; pipeline_v2 bumps `news:<slug>` on insert."""
+    slug = category_filter_slug(category)
+    return response_cache.get_or_set(f"news:{slug}", str(limit), lambda: serialize_articles(
+        card_query(db).filter(
+            Article.category_slug == slug
+        ).order_by(Article.publish_date.desc()).limit(limit).all()
+    ))
 
 @router.get("/technology")
-def get_tech(db: Session = Depends(get_db)):
-    return get_category_news("Technology", db)
+def get_tech(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("Technology", db))
 
 @router.get("/business")
-def get_business(db: Session = Depends(get_db)):
-    return get_category_news("Business", db)
+def get_business(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("Business", db))
 
 @router.get("/science")
-def get_science(db: Session = Depends(get_db)):
-    return get_category_news("Science", db)
+def get_science(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("Science", db))
 
 @router.get("/health")
-def get_health(db: Session = Depends(get_db)):
-    return get_category_news("Health", db)
+def get_health(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("Health", db))
 
 @router.get("/education")
-def get_education(db: Session = Depends(get_db)):
-    return get_category_news("Education", db)
+def get_education(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("Education", db))
 
 @router.get("/politics")
-def get_politics(db: Session = Depends(get_db)):
-    return get_category_news("Politics", db)
+def get_politics(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("Politics", db))
 
 @router.get("/world")
-def get_world(db: Session = Depends(get_db)):
-    return get_category_news("World", db)
+def get_world(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("World", db))
 
 @router.get("/environment")
-def get_environment(db: Session = Depends(get_db)):
-    return get_category_news("Environment", db)
+def get_environment(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("Environment", db))
 
 @router.get("/ai-startups")
-def get_ai(db: Session = Depends(get_db)):
-    return get_category_news("AI & Startups", db)
+def get_ai(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("AI & Startups", db))
 
 @router.get("/sports")
-def get_sports(db: Session = Depends(get_db)):
-    return get_category_news("Sports", db)
+def get_sports(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("Sports", db))
 
 @router.get("/culture")
-def get_culture(db: Session = Depends(get_db)):
-    return get_category_news("Culture", db)
+def get_culture(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, get_category_news("Culture", db))
 
 @router.get("/stats")
 def get_stats(db: Session = Depends(get_db)):
@@ -85,6 +85,40 @@ def get_stats(db: Session = Depends(get_db)):
         "status": "Live & Syncing"
     }
 
+@router.get("/scraper/hosts")
+def get_scraper_hosts(state: str = Query(None, description="closed, open or half_open"), db: Session = Depends(get_db)):
+    """Per-publisher health and circuit breaker state recorded by the scrapers."""
+    query = db.query(CrawlHost)
+    if state:
+        query = query.filter(CrawlHost.breaker_state == state)
+    hosts = query.order_by(CrawlHost.consecutive_failures.desc(), CrawlHost.host).all()
+    return {
+        "open": sum(1 for h in hosts if h.breaker_state == "open"),
+        "hosts": [
+            {
+                "host": h.host,
+                "state": h.breaker_state or "closed",
+                "open_until": h.breaker_open_until,
+                "consecutive_failures": h.consecutive_failures or 0,
+                "latency_ewma_ms": round(h.latency_ewma_ms, 1) if h.latency_ewma_ms is not None else None,
+                "last_error_class": h.last_error_class,
+                "error_counts": h.error_counts or {},
+                "requests": h.requests or 0,
+                "failures": h.failures or 0,
+                "last_success_at": h.last_success_at,
+                "last_failure_at": h.last_failure_at,
+            }
+            for h in hosts
+        ],
+    }
+
+@router.get("/scraper/pipeline")
+def get_scraper_pipeline():
+    """Per-stage counters (items in/out, drops, errors, busy time, throughput) of the latest run of each ingestion pipeline."""
+    return pipeline_stats.snapshot()
+
 @router.get("/quick-feed")
-def get_quick_feed(db: Session = Depends(get_db)):
-    return db.query(Article).order_by(Article.publish_date.desc()).limit(10).all()
+def get_quick_feed(request: Request, db: Session = Depends(get_db)):
+    return etag_json_response(request, response_cache.get_or_set("news:latest", "10", lambda: serialize_articles(
+        card_query(db).order_by(Article.publish_date.desc()).limit(10).all()
+    )))
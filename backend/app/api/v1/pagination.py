@@ -0,0 +1,124 @@
+"""
+Opaque keyset cursors for the article feeds.
+
+A cursor encodes the sort key of the last row on a page, so the next page is
+fetched with a range predicate on (feed_score, publish_date, id) instead of
+an OFFSET that makes the database walk every earlier row. feed_score is
+assumed non-NULL (the column defaults to 0.0 and migrate.py backfills
+legacy rows): NULL scores would match no range predicate.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+from app.models.article import Article
+
+FeedKey = Tuple[float, Optional[datetime], int]
+
+
+def _encode(values: list) -> str:
+    payload = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode(cursor: str, size: int) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
+
+
+def encode_cursor(article: Article) -> str:
+    publish_date = article.publish_date.isoformat() if article.publish_date else None
+    return _encode([article.feed_score or 0.0, publish_date, article.id])
+
+
+def decode_cursor(cursor: str) -> FeedKey:
+    feed_score, publish_date, article_id = _decode(cursor, 3)
+    try:
+        return (
+            float(feed_score),
+            datetime.fromisoformat(publish_date) if publish_date else None,
+            int(article_id),
+        )
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_rank_cursor(rank: float, article_id: int) -> str:
+    return _encode([rank, article_id])
+
+
+def feed_order(query):
+    """Canonical feed ordering, matching the ix_articles_feed_order index."""
+    return query.order_by(
+        Article.feed_score.desc(),
+        Article.publish_date.desc(),
+        Article.id.desc()
+    )
+
+
+def after_cursor(query, cursor: str, nulls_first: bool):
+    """
+    Restrict `query` to rows that sort strictly after the cursor in feed_order.
+
+    NULL publish dates sort first under DESC on Postgres and last on SQLite,
+    so the predicate has to follow the dialect to stay consistent with the
+    index order.
+    """
+    feed_score, publish_date, article_id = decode_cursor(cursor)
+
+    if publish_date is None:
+        same_date = and_(Article.publish_date.is_(None), Article.id < article_id)
+        later_date = Article.publish_date.isnot(None) if nulls_first else None
+    else:
+        same_date = and_(Article.publish_date == publish_date, Article.id < article_id)
+        later_date = Article.publish_date < publish_date
+        if not nulls_first:
+            later_date = or_(later_date, Article.publish_date.is_(None))
+
+    tie_break = same_date if later_date is None else or_(later_date, same_date)
+    return query.filter(
+        or_(
+            Article.feed_score < feed_score,
+            and_(Article.feed_score == feed_score, tie_break)
+        )
+    )
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    rank, article_id = _decode(cursor, 2)
+    try:
+        return float(rank), int(article_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_rank_cursor(query, cursor: str, rank_column):
+    """Keyset predicate for relevance-ordered search (rank ASC, id DESC)."""
+    rank, article_id = decode_rank_cursor(cursor)
+    return query.filter(
+        or_(
+            rank_column > rank,
+            and_(rank_column == rank, Article.id < article_id)
+        )
+    )
+
+
+def fetch_page(query, limit: int):
+    """
+    Fetch one page plus a single probe row.
+
+    The extra row tells us whether another page exists without running a
+    separate COUNT(*) over the same filters.
+    """
+    rows = query.limit(limit + 1).all()
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,69 @@
+"""
+Pre-serialized JSON responses for the feed endpoints.
+
+List endpoints load rows through card_query(), which reads only the display
+columns. Articles are converted through the schemas in app/schemas and the
+resulting dicts are cached per (schema, id, version, view count, score), so
+a hot article is encoded once rather than on every page that contains it. Responses carry an
+ETag over the encoded body and answer matching If-None-Match with a 304.
+"""
+import hashlib
+import json
+from typing import Iterable, List, Type
+
+from fastapi import Request, Response
+from pydantic import BaseModel
+from sqlalchemy import case, func, literal
+from sqlalchemy.orm import Session, load_only, with_expression
+
+from app.core.cache import LRUCache
+from app.models.article import Article, INLINE_IMAGE_MARKER
+from app.schemas.article import ArticleSummary
+
+# Columns behind ArticleSummary; content, embedding and inline image bytes
+# are never read for list views
+CARD_COLUMNS = (
+    Article.id, Article.title, Article.slug, Article.summary, Article.source, Article.url,
+    Article.author, Article.publish_date, Article.category, Article.region, Article.feed_score,
+    Article.is_featured, Article.read_time_minutes, Article.view_count,
+    Article.created_at, Article.updated_at,
+)
+
+IMAGE_REF = case(
+    (func.substr(Article.image_url, 1, len(INLINE_IMAGE_MARKER)) == INLINE_IMAGE_MARKER, literal(INLINE_IMAGE_MARKER)),
+    else_=Article.image_url
+)
+
+# Sized to comfortably hold the articles on every hot feed page
+_serialized = LRUCache(max_entries=5000)
+
+
+def card_query(db: Session):
+    """Article query that loads only the card projection (plus image_ref)."""
+    return db.query(Article).options(load_only(*CARD_COLUMNS), with_expression(Article.image_ref, IMAGE_REF))
+
+
+def serialize_article(article: Article, schema: Type[BaseModel] = ArticleSummary) -> dict:
+    version = article.updated_at or article.created_at
+    # Views change view_count/feed_score without touching updated_at
+    key = (schema.__name__, article.id, version.isoformat() if version else None, article.view_count, article.feed_score)
+    data = _serialized.get(key)
+    if data is None:
+        data = schema.model_validate(article).model_dump(mode="json")
+        _serialized.set(key, data)
+    return data
+
+
+def serialize_articles(articles: Iterable[Article], schema: Type[BaseModel] = ArticleSummary) -> List[dict]:
+    return [serialize_article(article, schema) for article in articles]
+
+
+def etag_json_response(request: Request, payload) -> Response:
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
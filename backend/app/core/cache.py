@@ -0,0 +1,137 @@
+"""
+Response cache for read-heavy endpoints.
+
+Entries live in a bounded in-process LRU with a TTL, optionally backed by
+Redis as a tier shared between API workers. Keys are versioned per
+namespace: writers bump a namespace's generation counter after a commit,
+which makes every older entry for it unreachable without scanning or
+deleting anything.
+"""
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LRUCache:
+    """Thread-safe LRU with an entry cap and an optional TTL."""
+
+    def __init__(self, max_entries: int = 256, ttl: Optional[int] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: "OrderedDict[Any, tuple]" = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value: Any):
+        with self.lock:
+            expires_at = time.time() + self.ttl if self.ttl else None
+            self.entries[key] = (expires_at, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+class ResponseCache:
+    def __init__(self, max_entries: int = 256, ttl: int = 300, redis_url: Optional[str] = None):
+        self.ttl = ttl
+        self.local = LRUCache(max_entries, ttl)
+        self.generations = {}
+        self.lock = threading.Lock()
+        self.redis = None
+        if redis_url and redis is not None:
+            try:
+                self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            except Exception as e:
+                logger.error(f"Response cache running without Redis tier: {e}")
+
+    # --- Generations ---
+
+    def generation(self, namespace: str) -> int:
+        if self.redis is not None:
+            try:
+                value = self.redis.get(f"cache:gen:{namespace}")
+                return int(value) if value else 0
+            except Exception as e:
+                logger.warning(f"Redis generation lookup failed: {e}")
+        with self.lock:
+            return self.generations.get(namespace, 0)
+
+    def bump(self, namespace: str):
+        """Invalidate every cached entry in `namespace`."""
+        with self.lock:
+            self.generations[namespace] = self.generations.get(namespace, 0) + 1
+        if self.redis is not None:
+            try:
+                self.redis.incr(f"cache:gen:{namespace}")
+            except Exception as e:
+                logger.warning(f"Redis generation bump failed: {e}")
+
+    # --- Entries ---
+
+    def get_or_set(self, namespace: str, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for `key` in the current generation of
+        `namespace`, computing and storing it with `loader` on a miss.
+        Values must be JSON-serialisable when the Redis tier is enabled.
+        """
+        full_key = f"cache:{namespace}:{self.generation(namespace)}:{key}"
+
+        value = self.local.get(full_key)
+        if value is not None:
+            return value
+
+        if self.redis is not None:
+            try:
+                raw = self.redis.get(full_key)
+                if raw is not None:
+                    value = json.loads(raw)
+                    self.local.set(full_key, value)
+                    return value
+            except Exception as e:
+                logger.warning(f"Redis cache read failed: {e}")
+
+        value = loader()
+        self.local.set(full_key, value)
+        if self.redis is not None:
+            try:
+                self.redis.set(full_key, json.dumps(value), ex=self.ttl)
+            except Exception as e:
+                logger.warning(f"Redis cache write failed: {e}")
+        return value
+
+    def clear(self):
+        self.local.clear()
+
+
+response_cache = ResponseCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    ttl=settings.CACHE_TTL_SECONDS,
+    redis_url=settings.CACHE_REDIS_URL or None,
+)
@@ -16,8 +16,46 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://redis:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://redis:6379/0"
     
+    # Response cache (in-process LRU; set CACHE_REDIS_URL to share entries and
+    # invalidations with the scraper workers, otherwise entries expire by TTL)
+    CACHE_MAX_ENTRIES: int = 256
+    CACHE_TTL_SECONDS: int = 300
+    CACHE_REDIS_URL: str = ""
+    
+    # Article views are buffered (in CACHE_REDIS_URL when set) and flushed in bulk
+    VIEW_FLUSH_INTERVAL_SECONDS: float = 5.0
+    VIEW_SCORE_WEIGHT: float = 2.0
+    
+    # Scraper fetch politeness (app/services/fetcher.py)
+    FETCH_MAX_CONCURRENCY: int = 32
+    FETCH_PER_HOST_CONCURRENCY: int = 4
+    FETCH_PER_HOST_DELAY_SECONDS: float = 0.5
+    FETCH_TIMEOUT_SECONDS: float = 15.0
+    # Feed/sitemap entries older than this are not fetched (app/services/feed_discovery.py)
+    FEED_MAX_AGE_HOURS: float = 48.0
+    # Bound of each queue between ingestion stages (app/services/stages.py)
+    PIPELINE_QUEUE_SIZE: int = 64
+    # Frontier crawl: tasks started per beat tick, URLs per lease, seconds each task keeps leasing
+    FRONTIER_CRAWL_TASKS: int = 4
+    FRONTIER_BATCH_SIZE: int = 50
+    FRONTIER_TASK_SECONDS: float = 50.0
+    # Drop scraped articles whose quality_engine score is below this; 0 keeps everything
+    INGEST_MIN_QUALITY_SCORE: float = 0.0
+    # Article extraction processes; 0 = one per CPU core
+    EXTRACT_WORKERS: int = 0
+    
     # ML Models
     SENTENCE_TRANSFORMER_MODEL: str = "all-MiniLM-L6-v2"
+    # "torch" (sentence-transformers) or "onnx" (int8 export from ml/export_onnx.py)
+    EMBEDDING_BACKEND: str = "torch"
+    ONNX_MODEL_DIR: str = "./ml/models/minilm-onnx"
+    # Storage format for Article.embedding_blob: float32, float16 or int8
+    EMBEDDING_STORAGE_DTYPE: str = "float16"
+    
+    # Search: "auto" uses the database full-text index when present,
+    # otherwise the in-process BM25 index ("database" / "memory" to force)
+    SEARCH_BACKEND: str = "auto"
+    SEARCH_INDEX_PATH: str = "./search_index.pkl"
     
     model_config = SettingsConfigDict(env_file=".env", extra="ignore")
 
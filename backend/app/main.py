@@ -1,17 +1,40 @@
+import asyncio
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.routers import api_router
 from app.core.config import settings
 from app.api.v1.endpoints import news
 
-from app.db.session import engine, Base
+from app.db.session import engine, Base, SessionLocal
+from app.services.search import ensure_search_index, use_memory_backend
+from app.services.search_engine import memory_search
+from app.services.view_counter import view_counter
+from app.services.extraction import shutdown_extraction_pool
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
+def warm_memory_search():
+    """Index the corpus for the in-process search backend before the first query."""
+    db = SessionLocal()
+    try:
+        if use_memory_backend(db):
+            memory_search.sync(db)
+    finally:
+        db.close()
+
 @app.on_event("startup")
 async def startup_event():
     # Create tables on startup
     Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
+    await asyncio.to_thread(warm_memory_search)
+    # Flush buffered article views to the DB in the background
+    app.state.view_flusher = asyncio.create_task(view_counter.run())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    view_counter.flush()
+    shutdown_extraction_pool()
 
 app.add_middleware(
     CORSMiddleware,
@@ -37,13 +60,13 @@ def root():
     }
 
 from app.services.scraper_v2 import SCRAPER_CONFIG
-from app.services.pipeline_v2 import run_premium_source_scrape
+from app.services.pipeline_v2 import scrape_sources
 from fastapi import BackgroundTasks
-import asyncio
 
 @app.get("/init-db")
 def init_db_manual():
     Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
     return {"status": "Tables Created"}
 
 @app.get("/force-scrape")
@@ -55,11 +78,6 @@ async def force_scrape_root(background_tasks: BackgroundTasks):
         except Exception as e:
             print(f"DB Init Error: {e}")
 
-        for config in SCRAPER_CONFIG:
-            try:
-                print(f"Scraping {config['name']}...")
-                await asyncio.to_thread(run_premium_source_scrape, config)
-            except Exception as e:
-                print(e)
+        await scrape_sources(SCRAPER_CONFIG)
     background_tasks.add_task(job)
     return {"status": "Scraper Started (Root)"}
@@ -1,7 +1,10 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Float, Boolean, JSON
+from sqlalchemy import BigInteger, Column, Integer, String, Text, DateTime, Float, Boolean, JSON, LargeBinary, Index
+from sqlalchemy.orm import query_expression
 from sqlalchemy.sql import func
 from app.db.session import Base
 
+INLINE_IMAGE_MARKER = "data:"
+
 class Article(Base):
     __tablename__ = "articles"
 
@@ -14,18 +17,25 @@ class Article(Base):
     source = Column(String, index=True)
     url = Column(String, unique=True)
     image_url = Column(String, nullable=True)
+    # Short stand-in for image_url in list views, populated by card queries:
+    # generated placeholders are stored inline as base64 data: URIs, which
+    # collapse to INLINE_IMAGE_MARKER
+    image_ref = query_expression()
     
     author = Column(String, nullable=True)
     publish_date = Column(DateTime(timezone=True), nullable=True)
     
-    category = Column(String, index=True)
+    category = Column(String, index=True)  # display name, see app/services/categories.py
+    category_slug = Column(String, index=True)  # canonical slug used for filtering
     region = Column(String, index=True, nullable=True) # US, Europe, Asia, India, etc.
     tags = Column(String, nullable=True) # Comma-separated or JSON
     
     # ML Fields
     sentiment_score = Column(Float, default=0.0)
     bias_label = Column(String, nullable=True)
-    embedding = Column(JSON, nullable=True) 
+    embedding = Column(JSON, nullable=True)  # legacy float list; migrate.py moves it to embedding_blob
+    embedding_blob = Column(LargeBinary, nullable=True)  # see app/utils/vectors.py
+    simhash = Column(BigInteger, nullable=True)  # signed 64-bit lexical fingerprint, see app/utils/simhash.py
 
     # Quality & Ranking Fields
     quality_score = Column(Float, default=0.0, index=True)
@@ -41,6 +51,13 @@ class Article(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        # Matches the feed ORDER BY so keyset pages are a single index range scan
+        Index("ix_articles_feed_order", feed_score.desc(), publish_date.desc(), id.desc()),
+        Index("ix_articles_category_feed_order", category_slug, feed_score.desc(), publish_date.desc(), id.desc()),
+        Index("ix_articles_category_recent", category_slug, publish_date.desc()),
+    )
+
 class TrendingTopic(Base):
     __tablename__ = "trending_topics"
     
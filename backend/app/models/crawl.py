@@ -0,0 +1,79 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, JSON, Index
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+class FeedState(Base):
+    """Validators and extracted links of the last download of a feed/section page."""
+    __tablename__ = "feed_states"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String, unique=True, index=True)
+    etag = Column(String, nullable=True)
+    last_modified = Column(String, nullable=True)
+    body_hash = Column(String, nullable=True)  # sha1 of the page body
+    links = Column(JSON, nullable=True)  # links extracted from that body, reused while unchanged
+
+    checked_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class FrontierUrl(Base):
+    """A canonical article URL waiting to be (re)fetched; the URL itself is the dedup key."""
+    __tablename__ = "crawl_frontier"
+
+    id = Column(Integer, primary_key=True)
+    url = Column(String, unique=True, nullable=False)
+    host = Column(String, index=True, nullable=False)
+    source = Column(String, nullable=True)
+    category_hint = Column(String, nullable=True)
+    priority = Column(Integer, default=2)  # lower is crawled first
+
+    status = Column(String, default="queued")  # queued, leased, done, failed
+    attempts = Column(Integer, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), server_default=func.now())
+    lease_owner = Column(String, nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
+    last_error = Column(String, nullable=True)
+
+    discovered_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # Lease scan: due URLs of one host, best priority first
+        Index("ix_crawl_frontier_due", host, status, priority, next_attempt_at),
+    )
+
+class CrawlHost(Base):
+    """Per-host politeness and health state shared by every crawl worker."""
+    __tablename__ = "crawl_hosts"
+
+    host = Column(String, primary_key=True)
+    next_eligible_at = Column(DateTime(timezone=True), server_default=func.now())
+    min_delay_seconds = Column(Float, default=2.0)
+
+    # Circuit breaker (app/services/host_health.py)
+    breaker_state = Column(String, default="closed")  # closed, open, half_open
+    breaker_open_until = Column(DateTime(timezone=True), nullable=True)
+    trips = Column(Integer, default=0)  # consecutive times the breaker opened
+    consecutive_failures = Column(Integer, default=0)
+    latency_ewma_ms = Column(Float, nullable=True)
+    last_error_class = Column(String, nullable=True)  # timeout, connect, blocked, rate_limited, server_error, network
+    error_counts = Column(JSON, nullable=True)  # {error class: count}
+    requests = Column(Integer, default=0)
+    failures = Column(Integer, default=0)
+    last_success_at = Column(DateTime(timezone=True), nullable=True)
+    last_failure_at = Column(DateTime(timezone=True), nullable=True)
+
+class SourceSchedule(Base):
+    """Adaptive crawl interval of one SCRAPER_CONFIG source, tracked from what each crawl yielded."""
+    __tablename__ = "source_schedules"
+
+    name = Column(String, primary_key=True)
+    interval_seconds = Column(Float, nullable=False)
+    next_run_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_run_at = Column(DateTime(timezone=True), nullable=True)
+
+    last_new = Column(Integer, default=0)  # links newly queued by the last crawl
+    rate_per_hour = Column(Float, nullable=True)  # smoothed publish rate (new links / hour)
+    idle_runs = Column(Integer, default=0)  # consecutive crawls with nothing new
+    consecutive_errors = Column(Integer, default=0)
+    last_error = Column(String, nullable=True)
@@ -0,0 +1,68 @@
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, model_validator
+
+from app.core.config import settings
+from app.models.article import INLINE_IMAGE_MARKER
+
+
+class ArticleSummary(BaseModel):
+    """
+    Card representation for lists and feeds: display fields only. Inline
+    (base64) images are replaced by a link to the article's image endpoint.
+    """
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: Optional[str] = None
+    slug: Optional[str] = None
+    summary: Optional[str] = None
+    source: Optional[str] = None
+    url: Optional[str] = None
+    image_url: Optional[str] = Field(None, validation_alias="image_ref")
+    author: Optional[str] = None
+    publish_date: Optional[datetime] = None
+    category: Optional[str] = None
+    region: Optional[str] = None
+    feed_score: Optional[float] = None
+    is_featured: Optional[bool] = None
+    read_time_minutes: Optional[int] = None
+    view_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    @model_validator(mode="after")
+    def link_inline_image(self):
+        if self.image_url == INLINE_IMAGE_MARKER:
+            self.image_url = f"{settings.API_V1_STR}/articles/{self.id}/image"
+        return self
+
+
+class ArticleDetail(BaseModel):
+    """Full article, as returned by a single-article fetch (no embedding)."""
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    title: Optional[str] = None
+    slug: Optional[str] = None
+    content: Optional[str] = None
+    summary: Optional[str] = None
+    source: Optional[str] = None
+    url: Optional[str] = None
+    image_url: Optional[str] = None
+    author: Optional[str] = None
+    publish_date: Optional[datetime] = None
+    category: Optional[str] = None
+    region: Optional[str] = None
+    tags: Optional[str] = None
+    sentiment_score: Optional[float] = None
+    bias_label: Optional[str] = None
+    quality_score: Optional[float] = None
+    readability_score: Optional[float] = None
+    feed_score: Optional[float] = None
+    is_featured: Optional[bool] = None
+    is_clickbait: Optional[bool] = None
+    read_time_minutes: Optional[int] = None
+    view_count: Optional[int] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
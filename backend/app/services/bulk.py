@@ -0,0 +1,153 @@
+"""
+Batched article writes, importable without the refining pipeline.
+
+bulk_insert_articles needs only a session, so lightweight callers (the
+legacy Celery scraper) import it from here instead of from pipeline_v2,
+which loads the embedding model through the deduplicator. The writer's
+prepare step needs that model, so it imports it on first use.
+"""
+import logging
+import threading
+from typing import Dict, List
+
+from sqlalchemy.orm import Session
+
+from app.core.cache import response_cache
+from app.db.session import SessionLocal
+from app.models.article import Article
+from app.services.embedding_index import embedding_index
+from app.services.search_engine import memory_search
+from app.services.seen_urls import seen_urls
+from app.services.simhash_index import simhash_index
+from app.utils.simhash import from_signed
+from app.utils.urls import canonicalize_url
+from app.utils.vectors import decode_embedding
+
+logger = logging.getLogger(__name__)
+
+
+def invalidate_feed_caches(category_slug: str):
+    """Drop cached /news listings that a new article in `category_slug` would appear in."""
+    response_cache.bump(f"news:{category_slug}")
+    response_cache.bump("news:latest")
+
+
+def bulk_insert_articles(db: Session, rows: List[dict]) -> Dict[str, int]:
+    """
+    Write `rows` with a single multi-row INSERT ... ON CONFLICT DO NOTHING.
+    All rows must share the same keys. Returns {url: id} for rows actually
+    inserted; anything missing hit an existing url/slug.
+    """
+    if not rows:
+        return {}
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    stmt = insert(Article).values(rows).on_conflict_do_nothing().returning(Article.id, Article.url)
+    inserted = {url: article_id for article_id, url in db.execute(stmt)}
+    db.commit()
+    return inserted
+
+
+class ArticleBatchWriter:
+    """
+    Batched save stage for the refined pipeline.
+
+    Articles are prepared as they arrive and written `batch_size` at a time
+    through bulk_insert_articles, all on one session. Every URL handed in
+    gets an entry in `outcomes`: inserted, conflict, duplicate_url,
+    duplicate_semantic, duplicate_lexical, low_quality or error. Callers
+    using one writer from several threads hold `lock` (one shared session).
+    """
+    def __init__(self, batch_size: int = 25):
+        self.batch_size = batch_size
+        self.lock = threading.Lock()
+        self.db = SessionLocal()
+        self.pending: List[dict] = []
+        self.outcomes: Dict[str, str] = {}
+        self.pending_embeddings: List[List[float]] = []
+        self.pending_simhashes: List[int] = []
+        seen_urls.sync(self.db)
+        from app.services.deduplicator import deduplicator
+        if deduplicator.model is None:
+            simhash_index.sync(self.db)
+        else:
+            embedding_index.sync(self.db)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @property
+    def inserted_count(self) -> int:
+        return sum(1 for outcome in self.outcomes.values() if outcome == "inserted")
+
+    def filter_new_urls(self, urls: List[str]) -> List[str]:
+        """
+        Canonical forms of `urls` not yet stored or handled by this writer.
+        The seen-URL filter rejects most in memory; its misses are confirmed
+        with one IN query.
+        """
+        candidates = [url for url in dict.fromkeys(canonicalize_url(url) for url in urls) if url not in self.outcomes]
+        if not candidates:
+            return []
+        unseen = seen_urls.filter_unseen(candidates)
+        existing = set(candidates) - set(unseen)
+        if unseen:
+            existing.update(url for (url,) in self.db.query(Article.url).filter(Article.url.in_(unseen)))
+        for url in existing:
+            self.outcomes[url] = "duplicate_url"
+        return [url for url in candidates if url not in existing]
+
+    def add(self, data: dict, source_name: str, hint_category: str = None, embedding=None):
+        from app.services.pipeline_v2 import prepare_refined_article
+        url = data['url']
+        if url in self.outcomes:
+            return
+        try:
+            row, outcome = prepare_refined_article(data, source_name, hint_category, self.pending_embeddings, embedding, self.pending_simhashes)
+        except Exception as e:
+            logger.error(f"Error preparing {url}: {e}")
+            row, outcome = None, "error"
+        self.outcomes[url] = outcome
+        if row is not None:
+            self.pending.append(row)
+            self.pending_embeddings.append(decode_embedding(row['embedding_blob']))
+            self.pending_simhashes.append(from_signed(row['simhash']))
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+    def flush(self):
+        rows, self.pending = self.pending, []
+        self.pending_embeddings = []
+        self.pending_simhashes = []
+        if not rows:
+            return
+        try:
+            inserted = bulk_insert_articles(self.db, rows)
+        except Exception as e:
+            logger.error(f"Error in premium pipeline batch insert: {e}")
+            self.db.rollback()
+            for row in rows:
+                self.outcomes[row['url']] = "error"
+            return
+
+        seen_urls.add(row['url'] for row in rows)
+        for row in rows:
+            article_id = inserted.get(row['url'])
+            self.outcomes[row['url']] = "inserted" if article_id else "conflict"
+            if article_id:
+                memory_search.add(article_id, row['title'], row['summary'], row['content'])
+                embedding_index.add(article_id, decode_embedding(row['embedding_blob']))
+                simhash_index.add(article_id, from_signed(row['simhash']))
+        for category_slug in {row['category_slug'] for row in rows if row['url'] in inserted}:
+            invalidate_feed_caches(category_slug)
+
+    def close(self):
+        try:
+            self.flush()
+        finally:
+            self.db.close()
@@ -0,0 +1,72 @@
+"""
+Canonical article categories.
+
+The classifiers emit different label sets (smart_categorize uses
+"Business & Finance", ai_classify "Business", the topic model
+"Entertainment", ...). Every writer maps its label through
+canonical_category() and stores both the slug (indexed, used for filtering)
+and the display name.
+"""
+import re
+from typing import Optional
+
+# slug -> display name
+CATEGORIES = {
+    'technology': 'Technology',
+    'ai-startups': 'AI & Startups',
+    'business': 'Business & Finance',
+    'science': 'Science',
+    'health': 'Health',
+    'education': 'Education',
+    'politics': 'Politics',
+    'world': 'World',
+    'environment': 'Environment',
+    'sports': 'Sports',
+    'culture': 'Culture',
+    'general': 'General',
+}
+
+# Alias table: lower-cased label -> slug
+CATEGORY_ALIASES = {
+    'tech': 'technology',
+    'sci-tech': 'technology',
+    'ai & startups': 'ai-startups',
+    'ai': 'ai-startups',
+    'artificial intelligence': 'ai-startups',
+    'startups': 'ai-startups',
+    'business & finance': 'business',
+    'finance': 'business',
+    'economy': 'business',
+    'markets': 'business',
+    'medicine': 'health',
+    'international': 'world',
+    'national': 'world',
+    'climate': 'environment',
+    'sport': 'sports',
+    'entertainment': 'culture',
+    'arts': 'culture',
+    'lifestyle': 'culture',
+}
+CATEGORY_ALIASES.update({slug: slug for slug in CATEGORIES})
+CATEGORY_ALIASES.update({name.lower(): slug for slug, name in CATEGORIES.items()})
+
+DEFAULT_CATEGORY = 'general'
+
+
+def canonical_category(label: Optional[str], default: Optional[str] = DEFAULT_CATEGORY) -> Optional[str]:
+    """Slug for a classifier label or request parameter; `default` when unknown."""
+    if not label:
+        return default
+    return CATEGORY_ALIASES.get(label.strip().lower(), default)
+
+
+def category_name(slug: str) -> str:
+    return CATEGORIES.get(slug, CATEGORIES[DEFAULT_CATEGORY])
+
+
+def category_filter_slug(label: str) -> str:
+    """
+    Slug to filter on for a user-supplied category. Unknown labels are
+    slugified as-is so they match nothing instead of widening to 'general'.
+    """
+    return canonical_category(label, default=None) or re.sub(r"[^a-z0-9]+", "-", label.lower()).strip("-")
@@ -1,18 +1,18 @@
 import logging
 try:
-    import torch
-    from sentence_transformers import SentenceTransformer, util
+    import numpy as np
 except ImportError:
-    torch = None
-    SentenceTransformer = None
-    util = None
+    np = None
 
 from typing import List, Optional
 
+from app.core.config import settings
+from app.services.embedding_index import embedding_index
+
 logger = logging.getLogger(__name__)
 
 class Deduplicator:
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2", backend: str = "torch", onnx_model_dir: Optional[str] = None):
         self.model = None
         try:
             # Check for Lite Mode (to save RAM on free Cloud hosting)
@@ -21,9 +21,17 @@ class Deduplicator:
                 logger.info("Lite Mode enabled: Skipping AI model load.")
                 return
 
-            self.device = "cuda" if torch.cuda.is_available() else "cpu"
-            self.model = SentenceTransformer(model_name).to(self.device)
-            logger.info(f"Deduplicator loaded on {self.device}")
+            if backend == "onnx":
+                # int8 ONNX export on onnxruntime: no torch import, smaller and faster on CPU
+                from app.services.onnx_encoder import OnnxSentenceEncoder
+                self.device = "cpu"
+                self.model = OnnxSentenceEncoder(onnx_model_dir)
+            else:
+                import torch
+                from sentence_transformers import SentenceTransformer
+                self.device = "cuda" if torch.cuda.is_available() else "cpu"
+                self.model = SentenceTransformer(model_name).to(self.device)
+            logger.info(f"Deduplicator loaded ({backend}) on {self.device}")
         except Exception as e:
             logger.error(f"Failed to load AI Model (Running in Lite Mode): {e}")
             self.model = None
@@ -31,21 +39,43 @@ class Deduplicator:
     def get_embedding(self, text: str) -> List[float]:
         if not self.model:
             return [0.0] * 384 # Dummy vector
-        embedding = self.model.encode(text, convert_to_tensor=True)
+        embedding = self.model.encode(text, convert_to_numpy=True)
         return embedding.tolist()
 
-    def is_duplicate(self, new_embedding_list: List[float], existing_embeddings: List[List[float]], threshold: float = 0.9) -> bool:
-        if not self.model or not existing_embeddings:
+    def get_embeddings(self, texts: List[str], batch_size: int = 32):
+        """Embed many texts in batched forward passes. Returns a float32 array of shape (len(texts), dim)."""
+        if not self.model:
+            return np.zeros((len(texts), 384), dtype=np.float32) # Dummy vectors
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        return self.model.encode(texts, batch_size=batch_size, convert_to_numpy=True).astype(np.float32, copy=False)
+
+    def is_duplicate(self, new_embedding_list: List[float], existing_embeddings: Optional[List[List[float]]] = None, threshold: float = 0.9) -> bool:
+        """
+        Compare against the sliding-window embedding index (kept warm by the
+        pipeline), plus any `existing_embeddings` not yet stored.
+        """
+        if not self.model:
             return False
-            
-        new_emb = torch.tensor(new_embedding_list).to(self.device)
-        exist_embs = torch.tensor(existing_embeddings).to(self.device)
+
+        if embedding_index.max_similarity(new_embedding_list) > threshold:
+            return True
+        if not existing_embeddings:
+            return False
+
+        new_emb = np.asarray(new_embedding_list, dtype=np.float32)
+        exist_embs = np.asarray(existing_embeddings, dtype=np.float32)
         
         # Compute cosine similarity
-        similarities = util.cos_sim(new_emb, exist_embs)[0]
-        max_sim = torch.max(similarities).item()
+        norms = np.linalg.norm(exist_embs, axis=1) * np.linalg.norm(new_emb)
+        similarities = (exist_embs @ new_emb) / np.where(norms == 0, 1.0, norms)
+        max_sim = float(similarities.max())
         
         return max_sim > threshold
 
 # Singleton instance
-deduplicator = Deduplicator()
+deduplicator = Deduplicator(
+    model_name=settings.SENTENCE_TRANSFORMER_MODEL,
+    backend=settings.EMBEDDING_BACKEND,
+    onnx_model_dir=settings.ONNX_MODEL_DIR,
+)
@@ -0,0 +1,152 @@
+"""
+Sliding-window embedding index for semantic deduplication.
+
+Holds the normalized float32 embeddings of the last WINDOW_HOURS of articles
+in one NumPy matrix, so checking a candidate is a single matrix-vector
+product instead of reloading and re-tensoring recent rows per article. The
+window is warm-loaded on first use, appended to as the pipeline inserts,
+and caught up by id for rows written by other processes.
+"""
+import logging
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+from app.utils.vectors import decode_embedding
+
+logger = logging.getLogger(__name__)
+
+WINDOW_HOURS = 48
+SYNC_BATCH_SIZE = 500
+
+
+def utc_naive(value: Optional[datetime]) -> datetime:
+    if value is None:
+        return datetime.utcnow()
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+class EmbeddingIndex:
+    def __init__(self, window_hours: int = WINDOW_HOURS, initial_capacity: int = 1024):
+        self.window = timedelta(hours=window_hours)
+        self.initial_capacity = initial_capacity
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.max_synced_id = 0
+        self.added_ids = set()  # appended via add(), not yet passed by sync()
+        self.dim = None
+        self.size = 0
+        self.ids = None
+        self.times = None
+        self.matrix = None
+
+    def _normalize(self, embedding: Sequence[float]):
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        if norm == 0.0 or not np.isfinite(norm):
+            return None  # Lite Mode dummy vectors carry no signal
+        return vector / norm
+
+    def _reserve_locked(self, dim: int, extra: int):
+        if self.matrix is None:
+            capacity = max(self.initial_capacity, extra)
+            self.dim = dim
+            self.matrix = np.empty((capacity, dim), dtype=np.float32)
+            self.ids = np.empty(capacity, dtype=np.int64)
+            self.times = np.empty(capacity, dtype="datetime64[s]")
+        elif self.size + extra > len(self.matrix):
+            capacity = max(len(self.matrix) * 2, self.size + extra)
+            self.matrix = np.resize(self.matrix, (capacity, self.dim))
+            self.ids = np.resize(self.ids, capacity)
+            self.times = np.resize(self.times, capacity)
+
+    def _add_locked(self, article_id: int, vector, created_at: datetime):
+        if self.dim is not None and vector.shape[0] != self.dim:
+            logger.warning(f"Skipping embedding for article {article_id}: dimension {vector.shape[0]} != {self.dim}")
+            return
+        self._reserve_locked(vector.shape[0], 1)
+        self.matrix[self.size] = vector
+        self.ids[self.size] = article_id
+        self.times[self.size] = np.datetime64(utc_naive(created_at), "s")
+        self.size += 1
+
+    def _prune_locked(self):
+        if not self.size:
+            return
+        cutoff = np.datetime64(datetime.utcnow() - self.window, "s")
+        keep = self.times[:self.size] >= cutoff
+        kept = int(keep.sum())
+        if kept == self.size:
+            return
+        self.matrix[:kept] = self.matrix[:self.size][keep]
+        self.ids[:kept] = self.ids[:self.size][keep]
+        self.times[:kept] = self.times[:self.size][keep]
+        self.size = kept
+
+    def add(self, article_id: int, embedding: Sequence[float], created_at: Optional[datetime] = None):
+        """Append a freshly inserted article's embedding."""
+        if np is None or not self.loaded or embedding is None:
+            return
+        vector = self._normalize(embedding)
+        if vector is None:
+            return
+        with self.lock:
+            self._add_locked(article_id, vector, created_at)
+            self.added_ids.add(article_id)
+
+    def sync(self, db: Session):
+        """Warm-load the window on first use, then pick up rows newer than the high-water mark."""
+        if np is None:
+            return
+        cutoff = datetime.utcnow() - self.window
+        while True:
+            rows = db.query(Article.id, Article.created_at, Article.embedding_blob).filter(
+                Article.id > self.max_synced_id,
+                Article.created_at >= cutoff,
+                Article.embedding_blob.isnot(None),
+            ).order_by(Article.id).limit(SYNC_BATCH_SIZE).all()
+            if not rows:
+                break
+            with self.lock:
+                for article_id, created_at, blob in rows:
+                    if article_id in self.added_ids:
+                        self.added_ids.discard(article_id)
+                        continue
+                    vector = self._normalize(decode_embedding(blob))
+                    if vector is not None:
+                        self._add_locked(article_id, vector, created_at)
+                self.max_synced_id = max(self.max_synced_id, rows[-1][0])
+        with self.lock:
+            self._prune_locked()
+            if not self.loaded:
+                logger.info(f"Embedding index warm-loaded with {self.size} vectors")
+            self.loaded = True
+
+    def max_similarity(self, embedding: Sequence[float]) -> float:
+        """Highest cosine similarity between `embedding` and the window (0.0 when empty)."""
+        if np is None or not self.size:
+            return 0.0
+        vector = self._normalize(embedding)
+        if vector is None:
+            return 0.0
+        with self.lock:
+            if vector.shape[0] != self.dim:
+                return 0.0
+            return float((self.matrix[:self.size] @ vector).max())
+
+    def __len__(self):
+        return self.size
+
+
+# Singleton instance
+embedding_index = EmbeddingIndex()
@@ -0,0 +1,98 @@
+"""
+CPU-bound article extraction, off the event loop and out of the GIL.
+
+Downloads happen concurrently in the async fetcher; the raw HTML is handed
+to a ProcessPoolExecutor sized to the machine's cores, where newspaper3k
+parses it. With EXTRACT_WORKERS=1 extraction runs on a thread instead.
+
+Daemonic processes cannot start a pool either, and Celery prefork children
+are daemonic. The scraper queue is therefore served by a worker with a
+thread pool (`celery -A app.worker worker -Q scraper --pool threads`, see
+docker-compose.yml), whose main process owns the extraction pool shared by
+all its task threads. A prefork scraper worker still works, but extracts
+on a thread and logs a warning.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Optional
+
+from newspaper import Article as NewspaperArticle
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MIN_TEXT_CHARS = 200
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_daemon_warned = False
+
+
+def extract_article(url: str, html: Optional[str]) -> Optional[Dict]:
+    """Parse an article page (downloads it when `html` is None). Runs in pool workers, so top-level."""
+    try:
+        article = NewspaperArticle(url)
+        if html is None:
+            article.download()
+        else:
+            article.download(input_html=html)
+        article.parse()
+
+        if len(article.text) < MIN_TEXT_CHARS:
+            return None
+
+        return {
+            'title': article.title,
+            'content': article.text,
+            'author': ", ".join(article.authors),
+            'publish_date': article.publish_date or datetime.utcnow(),
+            'image_url': article.top_image,
+            'url': url
+        }
+    except Exception as e:
+        logger.debug(f"Failed to parse {url}: {e}")
+        return None
+
+
+def extraction_workers() -> int:
+    return settings.EXTRACT_WORKERS or os.cpu_count() or 1
+
+
+def get_extraction_pool() -> Optional[ProcessPoolExecutor]:
+    """Shared process pool, created on first use; None where a pool can't or shouldn't be used."""
+    global _pool, _daemon_warned
+    workers = extraction_workers()
+    if workers <= 1:
+        return None
+    if multiprocessing.current_process().daemon:
+        if not _daemon_warned:
+            _daemon_warned = True
+            logger.warning("Extraction pool unavailable in a daemonic process (Celery prefork); "
+                           "extracting on threads. Run the scraper queue with --pool threads.")
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            logger.info(f"Extraction pool started with {workers} processes")
+        return _pool
+
+
+def shutdown_extraction_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+
+
+async def extract(url: str, html: str) -> Optional[Dict]:
+    pool = get_extraction_pool()
+    if pool is None:
+        return await asyncio.to_thread(extract_article, url, html)
+    return await asyncio.get_running_loop().run_in_executor(pool, extract_article, url, html)
@@ -0,0 +1,134 @@
+"""
+Conditional GET state for feed and section pages.
+
+Each feed URL keeps the ETag / Last-Modified validators and a hash of the
+body from its last download (app/models/crawl.py). Requests send
+If-None-Match / If-Modified-Since; on a 304, or a 200 whose body hashes the
+same, the links extracted last time are reused and the page is not parsed
+again.
+"""
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from app.db.session import SessionLocal
+from app.models.crawl import FeedState
+from app.services.host_health import host_health
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FeedSnapshot:
+    url: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    body_hash: Optional[str] = None
+    links: Optional[List[str]] = None
+    changed: bool = field(default=True, compare=False)
+
+
+def body_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8", "replace")).hexdigest()
+
+
+class FeedCache:
+    def load(self, urls: Iterable[str]) -> Dict[str, FeedSnapshot]:
+        urls = list(urls)
+        if not urls:
+            return {}
+        db = SessionLocal()
+        try:
+            rows = db.query(FeedState).filter(FeedState.url.in_(urls)).all()
+            return {
+                row.url: FeedSnapshot(row.url, row.etag, row.last_modified, row.body_hash, row.links, changed=False)
+                for row in rows
+            }
+        finally:
+            db.close()
+
+    def request_headers(self, snapshot: Optional[FeedSnapshot]) -> Dict[str, str]:
+        headers = {}
+        if snapshot is not None and snapshot.links is not None:
+            if snapshot.etag:
+                headers['If-None-Match'] = snapshot.etag
+            if snapshot.last_modified:
+                headers['If-Modified-Since'] = snapshot.last_modified
+        return headers
+
+    def resolve(
+        self,
+        url: str,
+        snapshot: Optional[FeedSnapshot],
+        status_code: int,
+        text: str,
+        headers: Mapping[str, str],
+        extract: Callable[[str], List[str]],
+    ) -> Tuple[List[str], FeedSnapshot]:
+        """Links for a fetched feed page, extracting them only when the page changed."""
+        if status_code == 304 and snapshot is not None and snapshot.links is not None:
+            return snapshot.links, snapshot
+
+        digest = body_hash(text)
+        etag = headers.get('etag')  # httpx dicts are lower-cased, requests' are case-insensitive
+        last_modified = headers.get('last-modified')
+        if snapshot is not None and snapshot.links is not None and snapshot.body_hash == digest:
+            links, changed = snapshot.links, False
+        else:
+            links, changed = extract(text), True
+        return links, FeedSnapshot(url, etag, last_modified, digest, links, changed=changed)
+
+    def save(self, snapshots: Iterable[FeedSnapshot]):
+        snapshots = {s.url: s for s in snapshots}
+        if not snapshots:
+            return
+        db = SessionLocal()
+        try:
+            rows = {row.url: row for row in db.query(FeedState).filter(FeedState.url.in_(list(snapshots)))}
+            now = datetime.utcnow()
+            for url, snapshot in snapshots.items():
+                row = rows.get(url)
+                if row is None:
+                    row = FeedState(url=url)
+                    db.add(row)
+                row.etag = snapshot.etag
+                row.last_modified = snapshot.last_modified
+                row.body_hash = snapshot.body_hash
+                row.links = snapshot.links
+                row.checked_at = now
+                if snapshot.changed:
+                    row.changed_at = now
+            db.commit()
+        except Exception as e:
+            logger.error(f"Failed to save feed state: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+    def fetch_links(self, http, url: str, extract: Callable[[str], List[str]], timeout: float = 15) -> List[str]:
+        """
+        Blocking conditional GET through a requests-style `http` (module or
+        Session) for the synchronous scrapers, guarded by the host's circuit
+        breaker.
+        """
+        snapshot = self.load([url]).get(url)
+        r = host_health.get(http, url, headers=self.request_headers(snapshot), timeout=timeout)
+        if r.status_code != 304:
+            r.raise_for_status()
+        links, updated = self.resolve(url, snapshot, r.status_code, r.text, r.headers, extract)
+        self.save([updated])
+        if not updated.changed:
+            logger.info(f"Feed unchanged, reusing {len(links)} links: {url}")
+        return links
+
+    def fetch_if_changed(self, http, url: str, timeout: float = 10) -> Optional[str]:
+        """Body of `url` if it changed since the last call, else None (for scrapers that parse pages themselves)."""
+        changed = []
+        self.fetch_links(http, url, lambda text: changed.append(text) or [], timeout)
+        return changed[0] if changed else None
+
+
+# Singleton instance
+feed_cache = FeedCache()
@@ -0,0 +1,127 @@
+"""
+Async HTTP fetch layer for the scrapers.
+
+One pooled httpx.AsyncClient (keep-alive connections, HTTP timeouts) shared
+by every source in a scrape cycle. Politeness is enforced here, not by the
+callers:
+- a global cap on in-flight requests
+- a per-host cap on in-flight requests
+- a minimum delay between request starts to the same host
+- a per-host circuit breaker (app/services/host_health.py) that refuses
+  requests to failing hosts instead of waiting out their timeouts
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.services.host_health import classify_error, host_health
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+
+@dataclass
+class FetchResult:
+    url: str
+    final_url: str
+    status_code: int
+    text: str
+    headers: Dict[str, str]
+
+
+class AsyncFetcher:
+    def __init__(
+        self,
+        max_concurrency: int = 32,
+        per_host_concurrency: int = 4,
+        per_host_delay: float = 0.5,
+        timeout: float = 15.0,
+    ):
+        self.per_host_concurrency = per_host_concurrency
+        self.per_host_delay = per_host_delay
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.client: Optional[httpx.AsyncClient] = None
+        self.global_slots: Optional[asyncio.Semaphore] = None
+        self.host_slots: Dict[str, asyncio.Semaphore] = {}
+        self.host_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+        self.host_next_start: Dict[str, float] = defaultdict(float)
+
+    async def __aenter__(self):
+        await asyncio.to_thread(host_health.load)
+        self.client = httpx.AsyncClient(
+            headers={'User-Agent': USER_AGENT},
+            timeout=httpx.Timeout(self.timeout, connect=min(self.timeout, 5.0)),
+            limits=httpx.Limits(
+                max_connections=self.max_concurrency,
+                max_keepalive_connections=self.max_concurrency,
+                keepalive_expiry=30.0,
+            ),
+            follow_redirects=True,
+        )
+        self.global_slots = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.client.aclose()
+        self.client = None
+        await asyncio.to_thread(host_health.save)
+
+    def _host_slots(self, host: str) -> asyncio.Semaphore:
+        if host not in self.host_slots:
+            self.host_slots[host] = asyncio.Semaphore(self.per_host_concurrency)
+        return self.host_slots[host]
+
+    async def _wait_for_turn(self, host: str):
+        """Space request starts to `host` at least per_host_delay apart."""
+        async with self.host_locks[host]:
+            now = time.monotonic()
+            start = max(now, self.host_next_start[host])
+            self.host_next_start[host] = start + self.per_host_delay
+        if start > now:
+            await asyncio.sleep(start - now)
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> Optional[FetchResult]:
+        """GET `url`; None on network errors, non-2xx/304 responses and hosts whose circuit is open."""
+        host = urlsplit(url).netloc.lower()
+        async with self._host_slots(host):
+            if not host_health.allow(host):
+                logger.debug(f"Circuit open, skipping {url}")
+                return None
+            await self._wait_for_turn(host)
+            async with self.global_slots:
+                started = time.monotonic()
+                try:
+                    response = await self.client.get(url, headers=headers)
+                except httpx.HTTPError as e:
+                    host_health.record(host, (time.monotonic() - started) * 1000, classify_error(exc=e))
+                    logger.debug(f"Fetch failed for {url}: {e!r}")
+                    return None
+        host_health.record(host, (time.monotonic() - started) * 1000, classify_error(status_code=response.status_code))
+        if response.status_code != 304 and not response.is_success:
+            logger.debug(f"Fetch {url} returned HTTP {response.status_code}")
+            return None
+        return FetchResult(
+            url=url,
+            final_url=str(response.url),
+            status_code=response.status_code,
+            text=response.text,
+            headers=dict(response.headers),
+        )
+
+
+def make_fetcher() -> AsyncFetcher:
+    return AsyncFetcher(
+        max_concurrency=settings.FETCH_MAX_CONCURRENCY,
+        per_host_concurrency=settings.FETCH_PER_HOST_CONCURRENCY,
+        per_host_delay=settings.FETCH_PER_HOST_DELAY_SECONDS,
+        timeout=settings.FETCH_TIMEOUT_SECONDS,
+    )
@@ -0,0 +1,178 @@
+"""
+Persistent crawl frontier shared by the scraper workers.
+
+Discovery enqueues canonical article URLs (crawl_frontier, deduplicated on
+the URL); crawl workers lease batches of due URLs, fetch them and report
+back. Leasing honours a per-host next-eligible time (crawl_hosts), so any
+number of workers together never hit one publisher faster than its
+min_delay_seconds. Failures are retried with exponential backoff, hosts whose
+circuit breaker is open (app/services/host_health.py) are not leased, and a
+lease that is never reported back (a crashed worker) expires and is
+handed out again.
+
+On Postgres both the host and URL selection use FOR UPDATE SKIP LOCKED, so
+concurrent workers lease disjoint batches without blocking each other.
+"""
+import logging
+import socket
+import os
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from sqlalchemy import and_, exists, func, or_, update
+from sqlalchemy.orm import Session
+
+from app.models.crawl import CrawlHost, FrontierUrl
+from app.services.seen_urls import seen_urls
+from app.utils.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_SECONDS = 60
+BACKOFF_MAX_SECONDS = 6 * 3600
+LEASE_SECONDS = 300
+
+
+@dataclass
+class Lease:
+    id: int
+    url: str
+    source: Optional[str]
+    category_hint: Optional[str]
+    attempts: int
+
+
+def default_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _insert(db: Session, model):
+    if db.bind.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(model)
+
+
+class CrawlFrontier:
+    def __init__(self, lease_seconds: int = LEASE_SECONDS, max_attempts: int = MAX_ATTEMPTS):
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+
+    def enqueue(self, db: Session, links: Iterable[Tuple[str, Optional[str], Optional[str], int]]) -> int:
+        """
+        Queue (url, source, category_hint, priority) tuples. Already-stored
+        and already-queued URLs are skipped. Returns the number newly queued.
+        """
+        by_url = {}
+        for url, source, category_hint, priority in links:
+            url = canonicalize_url(url)
+            if url not in by_url or priority < by_url[url]['priority']:
+                by_url[url] = {'url': url, 'source': source, 'category_hint': category_hint, 'priority': priority}
+        seen_urls.sync(db)
+        fresh = set(seen_urls.filter_unseen(by_url))
+        now = datetime.utcnow()
+        rows = [
+            dict(row, host=urlsplit(url).netloc, status="queued", attempts=0, next_attempt_at=now, discovered_at=now)
+            for url, row in by_url.items() if url in fresh
+        ]
+        if not rows:
+            return 0
+
+        hosts = [{'host': host, 'next_eligible_at': now} for host in {row['host'] for row in rows}]
+        db.execute(_insert(db, CrawlHost).values(hosts).on_conflict_do_nothing())
+        added = db.execute(
+            _insert(db, FrontierUrl).values(rows).on_conflict_do_nothing().returning(FrontierUrl.id)
+        ).fetchall()
+        db.commit()
+        return len(added)
+
+    def lease(self, db: Session, owner: str, limit: int = 50, per_host: int = 5) -> List[Lease]:
+        """
+        Claim up to `limit` due URLs, at most `per_host` from any host whose
+        next-eligible time has passed, and push those hosts' next-eligible
+        time forward by min_delay_seconds per leased URL.
+        """
+        now = datetime.utcnow()
+        due = or_(
+            and_(FrontierUrl.status == "queued", FrontierUrl.next_attempt_at <= now),
+            and_(FrontierUrl.status == "leased", FrontierUrl.lease_expires_at < now),
+        )
+        hosts = db.query(CrawlHost).filter(
+            CrawlHost.next_eligible_at <= now,
+            or_(CrawlHost.breaker_open_until.is_(None), CrawlHost.breaker_open_until <= now),
+            exists().where(and_(FrontierUrl.host == CrawlHost.host, due)),
+        ).order_by(CrawlHost.next_eligible_at).limit(max(1, limit // per_host)).with_for_update(skip_locked=True).all()
+
+        leased: List[FrontierUrl] = []
+        for host in hosts:
+            room = min(per_host, limit - len(leased))
+            if room <= 0:
+                break
+            batch = db.query(FrontierUrl).filter(FrontierUrl.host == host.host, due).order_by(
+                FrontierUrl.priority, FrontierUrl.next_attempt_at
+            ).limit(room).with_for_update(skip_locked=True).all()
+            if not batch:
+                continue
+            host.next_eligible_at = now + timedelta(seconds=(host.min_delay_seconds or 0) * len(batch))
+            leased.extend(batch)
+
+        expires = now + timedelta(seconds=self.lease_seconds)
+        for row in leased:
+            row.status = "leased"
+            row.lease_owner = owner
+            row.lease_expires_at = expires
+        leases = [Lease(row.id, row.url, row.source, row.category_hint, row.attempts) for row in leased]
+        db.commit()
+        return leases
+
+    def complete(self, db: Session, ids: List[int]):
+        if ids:
+            db.execute(update(FrontierUrl).where(FrontierUrl.id.in_(ids)).values(
+                status="done", lease_owner=None, lease_expires_at=None, last_error=None
+            ))
+            db.commit()
+
+    def release(self, db: Session, ids: List[int], not_before: datetime):
+        """Hand leases back unattempted (their host's circuit is open), due again at `not_before`."""
+        if ids:
+            db.execute(update(FrontierUrl).where(FrontierUrl.id.in_(ids)).values(
+                status="queued", lease_owner=None, lease_expires_at=None, next_attempt_at=not_before
+            ))
+            db.commit()
+
+    def fail(self, db: Session, failures: List[Tuple[int, str]]):
+        """Requeue with exponential backoff, or give up after max_attempts."""
+        if not failures:
+            return
+        errors = dict(failures)
+        now = datetime.utcnow()
+        for row in db.query(FrontierUrl).filter(FrontierUrl.id.in_(list(errors))):
+            row.attempts = (row.attempts or 0) + 1
+            row.last_error = (errors[row.id] or "")[:500]
+            row.lease_owner = None
+            row.lease_expires_at = None
+            if row.attempts >= self.max_attempts:
+                row.status = "failed"
+            else:
+                row.status = "queued"
+                delay = min(BACKOFF_BASE_SECONDS * (2 ** (row.attempts - 1)), BACKOFF_MAX_SECONDS)
+                row.next_attempt_at = now + timedelta(seconds=delay)
+        db.commit()
+
+    def prune(self, db: Session, older_than: timedelta = timedelta(days=7)) -> int:
+        """Forget finished entries; the seen-URL filter keeps stored ones from being queued again."""
+        cutoff = datetime.utcnow() - older_than
+        deleted = db.query(FrontierUrl).filter(
+            FrontierUrl.status.in_(["done", "failed"]),
+            func.coalesce(FrontierUrl.updated_at, FrontierUrl.discovered_at) < cutoff,
+        ).delete(synchronize_session=False)
+        db.commit()
+        return deleted
+
+
+# Singleton instance
+frontier = CrawlFrontier()
@@ -0,0 +1,228 @@
+"""
+Per-host health and circuit breaker for the scrapers.
+
+Every request outcome is recorded per host: the latency EWMA, consecutive
+failures and a count per error class. After FAILURE_THRESHOLD consecutive
+failures the host's breaker opens, and requests to it are refused at once
+instead of each waiting out its timeout. Once the open period has passed,
+a single probe request is let through (half-open). Success closes the
+breaker. Failure reopens it for twice as long, up to MAX_OPEN_SECONDS.
+
+AsyncFetcher checks and records every request itself; the synchronous
+requests-based scrapers go through HostHealthRegistry.get().
+
+State lives in-process and is saved to crawl_hosts after each scrape
+batch. Breakers opened by other workers are picked up on load(), and the
+frontier does not lease URLs of hosts whose breaker is open.
+"""
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+
+from app.db.session import SessionLocal
+from app.models.crawl import CrawlHost
+
+logger = logging.getLogger(__name__)
+
+FAILURE_THRESHOLD = 5
+BASE_OPEN_SECONDS = 60
+MAX_OPEN_SECONDS = 3600
+LATENCY_SMOOTHING = 0.2
+
+
+@dataclass
+class HostHealth:
+    host: str
+    state: str = "closed"  # closed, open, half_open
+    open_until: Optional[datetime] = None
+    trips: int = 0
+    consecutive_failures: int = 0
+    latency_ewma_ms: Optional[float] = None
+    last_error_class: Optional[str] = None
+    error_counts: Dict[str, int] = field(default_factory=dict)
+    requests: int = 0
+    failures: int = 0
+    last_success_at: Optional[datetime] = None
+    last_failure_at: Optional[datetime] = None
+    probing: bool = False
+    # Counts not yet added to crawl_hosts
+    unsaved_requests: int = 0
+    unsaved_failures: int = 0
+    unsaved_errors: Dict[str, int] = field(default_factory=dict)
+
+
+def classify_error(exc: Optional[BaseException] = None, status_code: Optional[int] = None) -> Optional[str]:
+    """Error class of a request outcome, or None when the host answered normally (2xx/3xx or an ordinary 4xx)."""
+    if exc is not None:
+        if isinstance(exc, (httpx.TimeoutException, requests.Timeout)):
+            return "timeout"
+        if isinstance(exc, (httpx.ConnectError, httpx.RemoteProtocolError, requests.ConnectionError)):
+            return "connect"
+        return "network"
+    if status_code in (401, 403):
+        return "blocked"
+    if status_code == 429:
+        return "rate_limited"
+    if status_code is not None and status_code >= 500:
+        return "server_error"
+    return None
+
+
+class CircuitOpenError(Exception):
+    """Raised by HostHealthRegistry.get() when the host's breaker refuses the request."""
+
+
+class HostHealthRegistry:
+    def __init__(self):
+        self.hosts: Dict[str, HostHealth] = {}
+        self.dirty = set()
+        self.lock = threading.Lock()
+
+    def _get(self, host: str) -> HostHealth:
+        if host not in self.hosts:
+            self.hosts[host] = HostHealth(host)
+        return self.hosts[host]
+
+    def is_open(self, host: str) -> bool:
+        """True while requests to `host` would be refused (open and not yet due for a probe)."""
+        with self.lock:
+            health = self.hosts.get(host)
+            return health is not None and health.state != "closed" and health.open_until > datetime.utcnow() and (
+                health.state == "open" or health.probing
+            )
+
+    def allow(self, host: str) -> bool:
+        """Whether a request to `host` may go out now; lets one probe through once the open period ends."""
+        with self.lock:
+            health = self.hosts.get(host)
+            if health is None or health.state == "closed":
+                return True
+            now = datetime.utcnow()
+            if health.state == "open" and health.open_until <= now:
+                health.state = "half_open"
+                health.probing = False
+            # A probe that never reported back (cancelled) is replaced after BASE_OPEN_SECONDS
+            if health.state == "half_open" and (not health.probing or health.open_until <= now):
+                health.probing = True
+                health.open_until = now + timedelta(seconds=BASE_OPEN_SECONDS)
+                return True
+            return False
+
+    def record(self, host: str, latency_ms: float, error_class: Optional[str] = None):
+        now = datetime.utcnow()
+        with self.lock:
+            health = self._get(host)
+            health.requests += 1
+            health.unsaved_requests += 1
+            health.latency_ewma_ms = latency_ms if health.latency_ewma_ms is None else (
+                LATENCY_SMOOTHING * latency_ms + (1 - LATENCY_SMOOTHING) * health.latency_ewma_ms
+            )
+            self.dirty.add(host)
+
+            if error_class is None:
+                if health.state != "closed":
+                    logger.info(f"Circuit closed for {host}")
+                health.state, health.open_until, health.trips = "closed", None, 0
+                health.consecutive_failures = 0
+                health.probing = False
+                health.last_success_at = now
+                return
+
+            health.failures += 1
+            health.unsaved_failures += 1
+            health.consecutive_failures += 1
+            health.last_error_class = error_class
+            health.error_counts[error_class] = health.error_counts.get(error_class, 0) + 1
+            health.unsaved_errors[error_class] = health.unsaved_errors.get(error_class, 0) + 1
+            health.last_failure_at = now
+            if health.state == "half_open" or (
+                health.state == "closed" and health.consecutive_failures >= FAILURE_THRESHOLD
+            ):
+                health.trips += 1
+                seconds = min(BASE_OPEN_SECONDS * 2 ** (health.trips - 1), MAX_OPEN_SECONDS)
+                health.state, health.open_until, health.probing = "open", now + timedelta(seconds=seconds), False
+                logger.warning(f"Circuit open for {host} for {seconds}s after {error_class} ({health.consecutive_failures} consecutive failures)")
+
+    def get(self, http, url: str, **kwargs) -> requests.Response:
+        """
+        Blocking GET through a requests-style `http` (module or Session),
+        refused with CircuitOpenError while the host's breaker is open and
+        recorded like AsyncFetcher's requests.
+        """
+        host = urlsplit(url).netloc
+        if not self.allow(host):
+            raise CircuitOpenError(f"Circuit open for {host}")
+        started = time.monotonic()
+        try:
+            response = http.get(url, **kwargs)
+        except requests.RequestException as e:
+            self.record(host, (time.monotonic() - started) * 1000, classify_error(exc=e))
+            raise
+        self.record(host, (time.monotonic() - started) * 1000, classify_error(status_code=response.status_code))
+        return response
+
+    def load(self):
+        """Adopt breakers opened by other workers (crawl_hosts) that outlast this process's view."""
+        db = SessionLocal()
+        try:
+            rows = db.query(CrawlHost).filter(CrawlHost.breaker_open_until > datetime.utcnow()).all()
+        except Exception as e:
+            logger.error(f"Failed to load host health: {e}")
+            return
+        finally:
+            db.close()
+        with self.lock:
+            for row in rows:
+                health = self._get(row.host)
+                if health.state == "closed" or (health.open_until and health.open_until < row.breaker_open_until):
+                    health.state, health.open_until = "open", row.breaker_open_until
+                    health.trips = max(health.trips, row.trips or 0)
+
+    def save(self):
+        with self.lock:
+            changed = {host: self.hosts[host] for host in self.dirty}
+            self.dirty = set()
+        if not changed:
+            return
+        db = SessionLocal()
+        try:
+            rows = {row.host: row for row in db.query(CrawlHost).filter(CrawlHost.host.in_(list(changed)))}
+            now = datetime.utcnow()
+            for host, health in changed.items():
+                row = rows.get(host)
+                if row is None:
+                    row = CrawlHost(host=host, next_eligible_at=now, requests=0, failures=0)
+                    db.add(row)
+                row.breaker_state = health.state
+                row.breaker_open_until = health.open_until
+                row.trips = health.trips
+                row.consecutive_failures = health.consecutive_failures
+                row.latency_ewma_ms = health.latency_ewma_ms
+                row.last_error_class = health.last_error_class
+                counts = dict(row.error_counts or {})
+                for error_class, count in health.unsaved_errors.items():
+                    counts[error_class] = counts.get(error_class, 0) + count
+                row.error_counts = counts
+                row.requests = (row.requests or 0) + health.unsaved_requests
+                row.failures = (row.failures or 0) + health.unsaved_failures
+                row.last_success_at = health.last_success_at or row.last_success_at
+                row.last_failure_at = health.last_failure_at or row.last_failure_at
+                health.unsaved_requests = health.unsaved_failures = 0
+                health.unsaved_errors = {}
+            db.commit()
+        except Exception as e:
+            logger.error(f"Failed to save host health: {e}")
+            db.rollback()
+        finally:
+            db.close()
+
+
+# Singleton instance
+host_health = HostHealthRegistry()
@@ -0,0 +1,84 @@
+"""
+onnxruntime sentence encoder for CPU-only workers.
+
+Runs the int8-quantized ONNX export of the sentence-transformer produced by
+ml/export_onnx.py, with the same mean pooling and L2 normalization as
+all-MiniLM-L6-v2, so vectors keep the torch model's shape and stay
+comparable with stored embeddings. Needs only onnxruntime and tokenizers,
+not torch.
+"""
+import logging
+import os
+from typing import List, Union
+
+import numpy as np
+
+try:
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+except ImportError:
+    ort = None
+    Tokenizer = None
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILES = ("model_int8.onnx", "model.onnx")
+MAX_SEQ_LENGTH = 256
+
+
+class OnnxSentenceEncoder:
+    def __init__(self, model_dir: str, max_seq_length: int = MAX_SEQ_LENGTH):
+        if ort is None or Tokenizer is None:
+            raise RuntimeError("onnxruntime and tokenizers are required for EMBEDDING_BACKEND=onnx")
+
+        model_path = next(
+            (os.path.join(model_dir, name) for name in MODEL_FILES if os.path.exists(os.path.join(model_dir, name))),
+            None,
+        )
+        if model_path is None:
+            raise FileNotFoundError(f"No ONNX model in {model_dir}; run ml/export_onnx.py first")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_seq_length)
+        self.tokenizer.enable_padding()
+        self.dimension = self.session.get_outputs()[0].shape[-1]
+        logger.info(f"ONNX encoder loaded from {model_path}")
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.dimension
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        # Mean pooling over real tokens, then L2 normalize (the model's Normalize layer)
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        norms = np.linalg.norm(pooled, axis=1, keepdims=True)
+        return (pooled / np.clip(norms, 1e-12, None)).astype(np.float32)
+
+    def encode(self, texts: Union[str, List[str]], batch_size: int = 32, **kwargs) -> np.ndarray:
+        """SentenceTransformer.encode-compatible subset: returns NumPy arrays."""
+        single = isinstance(texts, str)
+        if single:
+            texts = [texts]
+        if not texts:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+
+        # Sort by length so each batch pads to similar lengths
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            idx = order[start:start + batch_size]
+            out[idx] = self._encode_batch([texts[i] for i in idx])
+        return out[0] if single else out
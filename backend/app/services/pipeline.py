@@ -1,12 +1,17 @@
+import asyncio
 from datetime import datetime
 from sqlalchemy.orm import Session
 from app.models.article import Article, TrendingTopic
 from app.services.scraper_engine import get_scrapers
+from app.services.host_health import host_health
 from app.db.session import SessionLocal
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from app.services.quality import quality_engine
 from app.services.media import image_processor
+from app.services.categories import canonical_category, category_name
+from app.services.seen_urls import seen_urls
+from app.services.stages import Stage, StreamPipeline
+from app.utils.urls import canonicalize_url
 import logging
 
 logger = logging.getLogger(__name__)
@@ -61,7 +66,7 @@ def process_and_save_article(scraper, link):
         valid_image = image_processor.process_image(data['image_url'])
 
         # --- 4. Classify ---
-        category = ai_classify(data['title'] + " " + data['content'])
+        category_slug = canonical_category(ai_classify(data['title'] + " " + data['content']))
         
         article = Article(
             title=data['title'],
@@ -71,7 +76,8 @@ def process_and_save_article(scraper, link):
             publish_date=data['publish_date'],
             author=data['author'],
             source=scraper.base_url,
-            category=category,
+            category=category_name(category_slug),
+            category_slug=category_slug,
             summary=data['content'][:200] + "...", 
             quality_score=q_metrics['score'],
             readability_score=q_metrics['readability'],
@@ -79,6 +85,7 @@ def process_and_save_article(scraper, link):
         )
         db.add(article)
         db.commit() # Commit IMMEDIATELY so user sees it
+        seen_urls.add([data['url']])
         print(f"Saved: {data['title'][:30]}...")
         return True
     
@@ -90,32 +97,46 @@ def process_and_save_article(scraper, link):
         db.close()
 
 def run_pipeline():
-    """Main ETL Pipeline: Scrape -> Clean -> Classify -> Score -> Save"""
+    """Main ETL Pipeline: Scrape -> Clean -> Classify -> Score -> Save, as streaming stages"""
     scrapers = get_scrapers()
-    
-    # 1. Collect all links first (Fast)
-    all_tasks = []
-    with ThreadPoolExecutor(max_workers=5) as executor:
-        for scraper in scrapers:
-            print(f"Collecting links from: {scraper.base_url}")
-            try:
-                links = scraper.scrape_feed()
-                for link in links:
-                    all_tasks.append((scraper, link))
-            except Exception as e:
-                print(f"Scraper failed for {scraper.base_url}: {e}")
 
-    print(f"Found {len(all_tasks)} links. Processing in parallel...")
+    # Drop links stored in earlier cycles before anything is downloaded
+    db = SessionLocal()
+    try:
+        seen_urls.sync(db)
+    finally:
+        db.close()
+    queued = set()
 
-    # 2. Process articles in parallel (Slow part made fast)
-    total_new = 0
-    with ThreadPoolExecutor(max_workers=10) as executor:
-        futures = [executor.submit(process_and_save_article, scraper, link) for scraper, link in all_tasks]
-        for future in as_completed(futures):
-            if future.result():
-                total_new += 1
-    
-    print(f"Pipeline finished. Added {total_new} new articles.")
+    async def collect(scraper):
+        print(f"Collecting links from: {scraper.base_url}")
+        return [(scraper, link) for link in await asyncio.to_thread(scraper.scrape_feed)]
+
+    async def seen_filter(batch):
+        unseen = set(seen_urls.filter_unseen(link for _, link in batch))
+        new = []
+        for scraper, link in batch:
+            link = canonicalize_url(link)
+            if link in unseen and link not in queued:
+                queued.add(link)
+                new.append((scraper, link))
+        return new
+
+    async def process(task):
+        return [task] if await asyncio.to_thread(process_and_save_article, *task) else []
+
+    pipeline = StreamPipeline("legacy", [
+        Stage("discover", collect, workers=5),
+        Stage("seen_filter", seen_filter, batch_size=50),
+        Stage("process", process, workers=10),
+    ])
+    host_health.load()
+    try:
+        stats = asyncio.run(pipeline.run(scrapers))
+    finally:
+        host_health.save()
+
+    print(f"Pipeline finished. Added {stats[-1].emitted} new articles from {len(queued)} new links.")
 
 if __name__ == "__main__":
     run_pipeline()
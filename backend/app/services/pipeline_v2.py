@@ -1,78 +1,364 @@
+import asyncio
 import logging
-from datetime import datetime, timedelta
-from sqlalchemy.orm import Session
+import ftfy
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 from app.db.session import SessionLocal
-from app.models.article import Article
+from app.services.bulk import ArticleBatchWriter, bulk_insert_articles, invalidate_feed_caches
 from app.services.scraper_v2 import scraper_v2
 from app.services.categorizer import smart_categorize
+from app.services.categories import canonical_category, category_name
 from app.services.deduplicator import deduplicator
+from app.services.extraction import extract, extraction_workers
+from app.services.feed_cache import feed_cache
+from app.services.feed_discovery import FeedEntry, fresh_entries
+from app.services.fetcher import AsyncFetcher, make_fetcher
+from app.services.frontier import Lease, default_owner, frontier
+from app.services.host_health import host_health
+from app.services.quality import quality_engine
+from app.services.simhash_index import simhash_index
+from app.services.source_scheduler import source_scheduler
+from app.services.stages import Stage, StreamPipeline
+from app.core.config import settings
+from app.utils.simhash import simhash, to_signed
+from app.utils.slugs import make_slug
+from app.utils.urls import canonicalize_url
+from app.utils.vectors import encode_embedding
 
 logger = logging.getLogger(__name__)
 
+# Parsed articles are embedded this many at a time
+EMBED_BATCH_SIZE = 32
+MAX_LINKS_PER_FEED = 15  # newest first; the adaptive scheduler crawls busier feeds more often
+
+def embedding_text(data: dict) -> str:
+    return f"{data['title']}\n{data['content'][:500]}"
+
+def prepare_refined_article(data: dict, source_name: str, hint_category: str, pending_embeddings: List[List[float]], embedding=None, pending_simhashes: List[int] = ()) -> Tuple[Optional[dict], str]:
+    """Embed -> Deduplicate -> Categorize. Returns (row for insert, outcome)."""
+    # 0. Lexical fingerprint: stored always, the dedup backend in Lite Mode (no embedding model)
+    signature = simhash(f"{data['title']}\n{data['content']}")
+    if deduplicator.model is None and simhash_index.is_duplicate(signature, pending_simhashes):
+        return None, "duplicate_lexical"
+
+    # 1. Generate Embedding (Semantic Deduplication), unless batch-embedded upstream
+    if embedding is None:
+        embedding = deduplicator.get_embedding(embedding_text(data))
+    
+    # 2. Check for Semantic Duplicates (stored window + this run's unsaved rows)
+    if deduplicator.is_duplicate(embedding, pending_embeddings):
+        return None, "duplicate_semantic"
+
+    # 3. Smart Categorization with Hint
+    category_slug = canonical_category(smart_categorize(data['title'], data['content'], data['url'], hint_category))
+    category = category_name(category_slug)
+    
+    # 4. Handle missing images with beautiful placeholders
+    image_url = data.get('image_url')
+    if not image_url or image_url.strip() == '':
+        from app.utils.placeholder_images import generate_placeholder_image
+        image_url = generate_placeholder_image(category, data['title'])
+    
+    return {
+        'title': data['title'],
+        'slug': make_slug(data['title'], data['url']),
+        'content': data['content'],
+        'url': data['url'],
+        'image_url': image_url,
+        'publish_date': data['publish_date'],
+        'author': data['author'],
+        'source': source_name,
+        'category': category,
+        'category_slug': category_slug,
+        'embedding_blob': encode_embedding(embedding, settings.EMBEDDING_STORAGE_DTYPE),
+        'simhash': to_signed(signature),
+        'quality_score': 80.0,
+        'readability_score': data.get('readability_score', 0.0),
+        'feed_score': 80.0,
+        'summary': data['content'][:250] + "..."
+    }, "ready"
+
 def process_and_save_refined_article(data: dict, source_name: str, hint_category: str = None) -> bool:
-    """Refined Article Pipeline: Clean -> Embed -> Deduplicate -> Categorize -> Save"""
+    """Refined Article Pipeline for a single article: Clean -> Embed -> Deduplicate -> Categorize -> Save"""
+    data = dict(data, url=canonicalize_url(data['url']))
+    with ArticleBatchWriter(batch_size=1) as writer:
+        if writer.filter_new_urls([data['url']]):
+            writer.add(data, source_name, hint_category)
+    return writer.outcomes.get(data['url']) == "inserted"
+
+async def fetch_feed_entries(feeds: List[Tuple[str, Optional[str]]], fetcher: AsyncFetcher) -> List[Tuple[Optional[str], List[FeedEntry]]]:
+    """(category hint, entries) for each fetched feed page, re-parsing only pages that changed."""
+    snapshots = await asyncio.to_thread(feed_cache.load, [feed_url for feed_url, _ in feeds])
+    pages = await asyncio.gather(*(
+        fetcher.fetch(feed_url, headers=feed_cache.request_headers(snapshots.get(feed_url)))
+        for feed_url, _ in feeds
+    ))
+
+    found = []
+    updated = []
+    for (feed_url, category_hint), page in zip(feeds, pages):
+        if page is None:
+            logger.error(f"Failed to scrape feed {feed_url}")
+            continue
+        # Unchanged pages (304 or same body hash) reuse last cycle's entries without re-parsing
+        entries, snapshot = feed_cache.resolve(
+            feed_url, snapshots.get(feed_url), page.status_code, page.text, page.headers,
+            lambda text: scraper_v2.extract_entries(feed_url, text),
+        )
+        updated.append(snapshot)
+        found.append((category_hint, [FeedEntry.from_json(e) for e in entries]))
+    await asyncio.to_thread(feed_cache.save, updated)
+    return found
+
+async def discover_links(source_config: dict, fetcher: AsyncFetcher) -> List[Tuple[Optional[str], List[str]]]:
+    """
+    (category hint, links) per feed of a source, minus stale and already-stored
+    entries. RSS/Atom/sitemap feeds are used when they return anything; the
+    HTML section pages only otherwise.
+    """
+    found = []
+    if source_config.get('syndication'):
+        found = [f for f in await fetch_feed_entries(source_config['syndication'], fetcher) if f[1]]
+    if not found:
+        found = await fetch_feed_entries(source_config['feeds'], fetcher)
+    if not found:
+        raise RuntimeError("no feed page could be fetched")
+    return [
+        (category_hint, await asyncio.to_thread(fresh_entries, entries))
+        for category_hint, entries in found
+    ]
+
+@dataclass
+class IngestItem:
+    """One article URL on its way through the ingestion stages."""
+    url: str
+    source: str
+    category_hint: Optional[str] = None
+    lease_id: Optional[int] = None
+    html: Optional[str] = None
+    data: Optional[dict] = None
+    embedding: Any = None
+
+def article_stages(writer: "ArticleBatchWriter", fetcher: AsyncFetcher, on_fetch: Callable[[IngestItem, bool], None] = None) -> List[Stage]:
+    """
+    fetch -> extract -> clean -> score -> embed -> store, for IngestItems.
+    `on_fetch(item, fetched)` is told the outcome of every download. store
+    runs dedup, categorization and the batched insert on `writer`, which
+    keeps the not-yet-flushed rows those checks compare against, so it is
+    one sequential stage.
+    """
+    async def fetch(item: IngestItem):
+        page = await fetcher.fetch(item.url)
+        if on_fetch is not None:
+            on_fetch(item, page is not None)
+        if page is None:
+            return []
+        item.html = page.text
+        return [item]
+
+    async def extract_stage(item: IngestItem):
+        item.data, item.html = await extract(item.url, item.html), None
+        return [item] if item.data else []
+
+    def clean_data(data: dict) -> dict:
+        # Unicode repair only: paragraph breaks and wording are kept as extracted
+        return dict(data, title=ftfy.fix_text(data['title']).strip(), content=ftfy.fix_text(data['content']).strip())
+
+    async def clean(item: IngestItem):
+        item.data = await asyncio.to_thread(clean_data, item.data)
+        return [item] if item.data['title'] and item.data['content'] else []
+
+    async def score(item: IngestItem):
+        """Records readability; drops articles only when INGEST_MIN_QUALITY_SCORE is set (off by default)."""
+        if settings.INGEST_MIN_QUALITY_SCORE <= 0:
+            # No threshold: readability is the only metric kept, so skip the full score
+            item.data['readability_score'] = await asyncio.to_thread(quality_engine.readability, item.data['content'])
+            return [item]
+        metrics = await asyncio.to_thread(quality_engine.calculate_quality_score, item.data['content'], item.data['title'])
+        if metrics['score'] < settings.INGEST_MIN_QUALITY_SCORE:
+            writer.outcomes[item.url] = "low_quality"
+            return []
+        item.data['readability_score'] = metrics['readability']
+        return [item]
+
+    async def embed(items: List[IngestItem]):
+        items = [item for item in items if item.url not in writer.outcomes]
+        if not items:
+            return []
+        try:
+            embeddings = await asyncio.to_thread(
+                deduplicator.get_embeddings, [embedding_text(item.data) for item in items], EMBED_BATCH_SIZE
+            )
+        except Exception as e:
+            logger.error(f"Batch embedding failed, embedding one by one: {e}")
+            embeddings = [None] * len(items)
+        for item, embedding in zip(items, embeddings):
+            item.embedding = embedding
+        return items
+
+    def add_locked(item: IngestItem):
+        with writer.lock:
+            writer.add(item.data, item.source, item.category_hint, item.embedding)
+
+    async def store(item: IngestItem):
+        await asyncio.to_thread(add_locked, item)
+        return [item] if writer.outcomes.get(item.url) in ("ready", "inserted") else []
+
+    return [
+        Stage("fetch", fetch, workers=settings.FETCH_MAX_CONCURRENCY),
+        Stage("extract", extract_stage, workers=extraction_workers() * 2),
+        Stage("clean", clean, workers=2),
+        Stage("score", score, workers=2),
+        Stage("embed", embed, batch_size=EMBED_BATCH_SIZE),
+        Stage("store", store),
+    ]
+
+async def ingest_sources(configs: List[dict], fetcher: AsyncFetcher) -> Dict[str, int]:
+    """
+    Stream `configs` through discover -> seen_filter -> article stages over
+    one writer. Returns {source name: articles added}.
+    """
+    writer = await asyncio.to_thread(ArticleBatchWriter)
+    url_sources: Dict[str, str] = {}
+
+    async def discover(config: dict):
+        return [(config['name'], hint, links) for hint, links in await discover_links(config, fetcher)]
+
+    def filter_locked(links: List[str]) -> List[str]:
+        with writer.lock:
+            return writer.filter_new_urls(links)
+
+    async def seen_filter(feed: Tuple[str, Optional[str], List[str]]):
+        name, category_hint, links = feed
+        links = [link for link in await asyncio.to_thread(filter_locked, links) if link not in url_sources]
+        items = []
+        for link in links[:MAX_LINKS_PER_FEED]:
+            url_sources[link] = name
+            items.append(IngestItem(link, name, category_hint))
+        return items
+
+    pipeline = StreamPipeline("scrape", [
+        Stage("discover", discover, workers=min(len(configs), 8) or 1),
+        Stage("seen_filter", seen_filter),
+    ] + article_stages(writer, fetcher))
+    try:
+        await pipeline.run(configs)
+    finally:
+        await asyncio.to_thread(writer.close)
+
+    logger.info(f"Scrape of {len(configs)} sources: {dict(Counter(writer.outcomes.values()))}")
+    added = Counter(url_sources[url] for url, outcome in writer.outcomes.items() if outcome == "inserted" and url in url_sources)
+    return {config['name']: added[config['name']] for config in configs}
+
+async def scrape_sources(configs: List[dict]) -> Dict[str, int]:
+    """Scrape all `configs` through the streaming stages over one pooled fetcher. Returns {source name: articles added}."""
+    async with make_fetcher() as fetcher:
+        return await ingest_sources(configs, fetcher)
+
+def run_premium_source_scrape(source_config: dict):
+    """Orchestrate scrape for a single source (blocking entry point for Celery and scripts)"""
+    return asyncio.run(scrape_sources([source_config]))[source_config['name']]
+
+def _enqueue_links(config: dict, links: List[Tuple[str, Optional[str], Optional[str], int]]) -> int:
     db = SessionLocal()
     try:
-        # 1. Quick Deduplication by URL
-        existing = db.query(Article).filter(Article.url == data['url']).first()
-        if existing:
-            return False
-
-        # 2. Generate Embedding (Semantic Deduplication)
-        embedding = deduplicator.get_embedding(f"{data['title']}\n{data['content'][:500]}")
-        
-        # 3. Check for Semantic Duplicates
-        recent_cutoff = datetime.utcnow() - timedelta(days=2)
-        recent_articles = db.query(Article).filter(Article.created_at >= recent_cutoff).limit(1000).all()
-        recent_embeddings = [a.embedding for a in recent_articles if a.embedding]
-        
-        if deduplicator.is_duplicate(embedding, recent_embeddings):
-            return False
-
-        # 4. Smart Categorization with Hint
-        category = smart_categorize(data['title'], data['content'], data['url'], hint_category)
-        
-        # 5. Handle missing images with beautiful placeholders
-        image_url = data.get('image_url')
-        if not image_url or image_url.strip() == '':
-            from app.utils.placeholder_images import generate_placeholder_image
-            image_url = generate_placeholder_image(category, data['title'])
-        
-        # 6. Save to DB
-        article = Article(
-            title=data['title'],
-            content=data['content'],
-            url=data['url'],
-            image_url=image_url,
-            publish_date=data['publish_date'],
-            author=data['author'],
-            source=source_name,
-            category=category,
-            embedding=embedding,
-            quality_score=80.0,
-            feed_score=80.0,
-            summary=data['content'][:250] + "..."
-        )
-        db.add(article)
-        db.commit()
-        return True
-    except Exception as e:
-        logger.error(f"Error in premium pipeline: {e}")
-        db.rollback()
-        return False
+        queued = frontier.enqueue(db, links)
+        source_scheduler.record(db, config, queued)
+        return queued
     finally:
         db.close()
 
-def run_premium_source_scrape(source_config: dict):
-    """Orchestrate scrape for a single source"""
-    new_count = 0
-    
-    for feed_url, category_hint in source_config['feeds']:
-        links = scraper_v2.get_links(feed_url)
-        for link in links[:15]:
-            article_data = scraper_v2.parse_article(link)
-            if article_data:
-                if process_and_save_refined_article(article_data, source_config['name'], category_hint):
-                    new_count += 1
-                
-    return new_count
+def _record_error(config: dict, error: Exception):
+    db = SessionLocal()
+    try:
+        source_scheduler.record(db, config, 0, error=repr(error))
+    finally:
+        db.close()
+
+async def discover_sources(configs: List[dict], priority: int = None) -> Dict[str, int]:
+    """
+    Fetch the feed pages of `configs`, queue their links in the crawl
+    frontier (at each source's priority unless `priority` is given) and
+    record the yield with the source scheduler. Returns {source name: newly queued}.
+    """
+    async with make_fetcher() as fetcher:
+        results = await asyncio.gather(*(discover_links(config, fetcher) for config in configs), return_exceptions=True)
+    queued = {}
+    for config, result in zip(configs, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error discovering {config['name']}: {result!r}")
+            await asyncio.to_thread(_record_error, config, result)
+            queued[config['name']] = 0
+            continue
+        link_priority = priority or config.get('priority', 2)
+        links = [
+            (link, config['name'], category_hint, link_priority)
+            for category_hint, feed_links in result for link in feed_links[:MAX_LINKS_PER_FEED]
+        ]
+        queued[config['name']] = await asyncio.to_thread(_enqueue_links, config, links)
+    return queued
+
+async def crawl_leases(leases: List[Lease], fetcher: AsyncFetcher) -> int:
+    """
+    Stream leased frontier URLs through the article stages, then report each
+    one back: fetched pages are done (stored or not), failed fetches are
+    retried with backoff, and URLs of hosts whose circuit is open go back
+    unattempted.
+    """
+    writer = await asyncio.to_thread(ArticleBatchWriter)
+    done, failed, released = [], [], []
+
+    def on_fetch(item: IngestItem, fetched: bool):
+        if fetched:
+            done.append(item.lease_id)
+        elif host_health.is_open(urlsplit(item.url).netloc):
+            released.append(item.lease_id)
+        else:
+            failed.append((item.lease_id, "fetch failed"))
+
+    items = (IngestItem(lease.url, lease.source or "Unknown", lease.category_hint, lease.id) for lease in leases)
+    try:
+        await StreamPipeline("frontier", article_stages(writer, fetcher, on_fetch)).run(items)
+    finally:
+        await asyncio.to_thread(writer.close)
+
+    db = SessionLocal()
+    try:
+        frontier.complete(db, done)
+        frontier.fail(db, failed)
+        frontier.release(db, released, datetime.utcnow())
+    finally:
+        db.close()
+    logger.info(f"Frontier batch of {len(leases)}: {dict(Counter(writer.outcomes.values()))}, {len(failed)} fetch failures, {len(released)} skipped (circuit open)")
+    return writer.inserted_count
+
+def _lease(limit: int, owner: str) -> List[Lease]:
+    db = SessionLocal()
+    try:
+        return frontier.lease(db, owner, limit=limit)
+    finally:
+        db.close()
+
+def run_frontier_crawl(batch_size: int = 50, max_seconds: float = 50.0, owner: str = None) -> int:
+    """
+    Lease and crawl frontier batches back to back until nothing is due or
+    `max_seconds` have passed (blocking entry point for Celery). Returns articles added.
+    """
+    owner = owner or default_owner()
+    deadline = time.monotonic() + max_seconds
+
+    async def crawl():
+        added = 0
+        async with make_fetcher() as fetcher:
+            while time.monotonic() < deadline:
+                leases = await asyncio.to_thread(_lease, batch_size, owner)
+                if not leases:
+                    break
+                added += await crawl_leases(leases, fetcher)
+        return added
+
+    return asyncio.run(crawl())
@@ -19,6 +19,13 @@ class QualityEngine:
         text = ' '.join(text.split())
         return text
 
+    def readability(self, content: str) -> float:
+        """Flesch Reading Ease of `content` (50.0 when textstat can't score it)."""
+        try:
+            return textstat.flesch_reading_ease(content)
+        except:
+            return 50.0
+
     def calculate_quality_score(self, content: str, title: str) -> dict:
         """
         Generates a quality score (0-100) based on heuristics.
@@ -38,10 +45,7 @@ class QualityEngine:
         # 2. Readability (Flesch Reading Ease)
         # 60-70 is standard. Higher is easier. Lower is academic.
         # We want accessible but smart (50-70 range).
-        try:
-            readability = textstat.flesch_reading_ease(content)
-        except:
-            readability = 50.0
+        readability = self.readability(content)
 
         if 50 <= readability <= 70: score += 10
         elif readability < 30: score -= 10 # Too dense
@@ -3,6 +3,8 @@ import requests
 from datetime import datetime
 from bs4 import BeautifulSoup
 from newspaper import Article as NewspaperArticle
+from app.services.feed_cache import feed_cache
+from app.services.host_health import CircuitOpenError
 
 logger = logging.getLogger(__name__)
 
@@ -15,10 +17,12 @@ class BaseScraper:
         })
 
     def fetch(self, url: str):
+        """Feed page body, or None when it failed or is unchanged since the last cycle."""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
-            return response.text
+            return feed_cache.fetch_if_changed(self.session, url)
+        except CircuitOpenError:
+            logger.debug(f"Circuit open, skipping {url}")
+            return None
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
             return None
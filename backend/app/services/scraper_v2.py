@@ -1,9 +1,7 @@
 import logging
-import requests
 from bs4 import BeautifulSoup
-from typing import List, Dict
-from datetime import datetime
-from newspaper import Article as NewspaperArticle
+from typing import List
+from app.services.feed_discovery import looks_like_feed, parse_feed
 
 logger = logging.getLogger(__name__)
 
@@ -13,139 +11,149 @@ class NewsSource:
         self.base_url = base_url
         self.feeds = feeds # List of category URLs or RSS feeds
 
+# 'feeds' are HTML section pages (link heuristics); 'syndication' lists RSS/Atom
+# feeds and news sitemaps, which are used instead whenever they return entries.
+# 'priority' (1 = breaking wires, 2 = category specialists, 3 = slow / deep dives)
+# seeds the adaptive crawl interval (app/services/source_scheduler.py).
 SCRAPER_CONFIG = [
     # Global Wire Agencies
-    {'name': 'Reuters', 'base_url': 'https://www.reuters.com', 'feeds': [
+    {'name': 'Reuters', 'base_url': 'https://www.reuters.com', 'priority': 1, 'feeds': [
         ('https://www.reuters.com/world/', 'World'),
         ('https://www.reuters.com/business/', 'Business & Finance'),
         ('https://www.reuters.com/technology/', 'Technology'),
         ('https://www.reuters.com/science/', 'Science')
+    ], 'syndication': [
+        ('https://www.reuters.com/arc/outboundfeeds/news-sitemap/?outputType=xml', None)
     ]},
-    {'name': 'Associated Press', 'base_url': 'https://apnews.com', 'feeds': [
+    {'name': 'Associated Press', 'base_url': 'https://apnews.com', 'priority': 1, 'feeds': [
         ('https://apnews.com/hub/politics', 'Politics'),
         ('https://apnews.com/hub/business', 'Business & Finance'),
         ('https://apnews.com/hub/science', 'Science'),
         ('https://apnews.com/hub/health', 'Health')
     ]},
-    {'name': 'Bloomberg', 'base_url': 'https://www.bloomberg.com', 'feeds': [
+    {'name': 'Bloomberg', 'base_url': 'https://www.bloomberg.com', 'priority': 1, 'feeds': [
         ('https://www.bloomberg.com/technology', 'Technology'),
         ('https://www.bloomberg.com/markets', 'Business & Finance'),
         ('https://www.bloomberg.com/politics', 'Politics')
+    ], 'syndication': [
+        ('https://www.bloomberg.com/feeds/sitemap_news.xml', None)
     ]},
     
     # AI & Startups Specialized
-    {'name': 'VentureBeat AI', 'base_url': 'https://venturebeat.com', 'feeds': [
+    {'name': 'VentureBeat AI', 'base_url': 'https://venturebeat.com', 'priority': 2, 'feeds': [
         ('https://venturebeat.com/category/ai/', 'AI & Startups')
+    ], 'syndication': [
+        ('https://venturebeat.com/category/ai/feed/', 'AI & Startups')
     ]},
-    {'name': 'AI News', 'base_url': 'https://www.artificialintelligence-news.com', 'feeds': [
+    {'name': 'AI News', 'base_url': 'https://www.artificialintelligence-news.com', 'priority': 2, 'feeds': [
         ('https://www.artificialintelligence-news.com/', 'AI & Startups')
+    ], 'syndication': [
+        ('https://www.artificialintelligence-news.com/feed/', 'AI & Startups')
     ]},
-    {'name': 'Sifted', 'base_url': 'https://sifted.eu', 'feeds': [
+    {'name': 'Sifted', 'base_url': 'https://sifted.eu', 'priority': 2, 'feeds': [
         ('https://sifted.eu/sections/artificial-intelligence/', 'AI & Startups'),
         ('https://sifted.eu/sections/startups/', 'AI & Startups')
     ]},
 
     # Science & Deep Tech
-    {'name': 'Nature', 'base_url': 'https://www.nature.com', 'feeds': [
+    {'name': 'Nature', 'base_url': 'https://www.nature.com', 'priority': 2, 'feeds': [
         ('https://www.nature.com/nature/articles?type=news', 'Science')
+    ], 'syndication': [
+        ('https://www.nature.com/nature.rss', 'Science')
     ]},
-    {'name': 'New Scientist', 'base_url': 'https://www.newscientist.com', 'feeds': [
+    {'name': 'New Scientist', 'base_url': 'https://www.newscientist.com', 'priority': 2, 'feeds': [
         ('https://www.newscientist.com/section/news/', 'Science'),
         ('https://www.newscientist.com/subject/environment/', 'Environment')
+    ], 'syndication': [
+        ('https://www.newscientist.com/section/news/feed/', 'Science'),
+        ('https://www.newscientist.com/subject/environment/feed/', 'Environment')
     ]},
 
     # Education
-    {'name': 'EdSurge', 'base_url': 'https://www.edsurge.com', 'feeds': [
+    {'name': 'EdSurge', 'base_url': 'https://www.edsurge.com', 'priority': 3, 'feeds': [
         ('https://www.edsurge.com/news', 'Education')
+    ], 'syndication': [
+        ('https://www.edsurge.com/articles_rss', 'Education')
     ]},
-    {'name': 'Inside Higher Ed', 'base_url': 'https://www.insidehighered.com', 'feeds': [
+    {'name': 'Inside Higher Ed', 'base_url': 'https://www.insidehighered.com', 'priority': 3, 'feeds': [
         ('https://www.insidehighered.com/news', 'Education')
     ]},
     
     # Environment (Heavy Content)
-    {'name': 'The Guardian Environment', 'base_url': 'https://www.theguardian.com', 'feeds': [
+    {'name': 'The Guardian Environment', 'base_url': 'https://www.theguardian.com', 'priority': 2, 'feeds': [
         ('https://www.theguardian.com/environment', 'Environment')
+    ], 'syndication': [
+        ('https://www.theguardian.com/environment/rss', 'Environment')
     ]},
-    {'name': 'Grist', 'base_url': 'https://grist.org', 'feeds': [
+    {'name': 'Grist', 'base_url': 'https://grist.org', 'priority': 3, 'feeds': [
         ('https://grist.org/news/', 'Environment')
+    ], 'syndication': [
+        ('https://grist.org/feed/', 'Environment')
     ]},
-    {'name': 'Mongabay', 'base_url': 'https://news.mongabay.com', 'feeds': [
+    {'name': 'Mongabay', 'base_url': 'https://news.mongabay.com', 'priority': 3, 'feeds': [
         ('https://news.mongabay.com/', 'Environment')
+    ], 'syndication': [
+        ('https://news.mongabay.com/feed/', 'Environment')
     ]},
-    {'name': 'National Geographic', 'base_url': 'https://www.nationalgeographic.com', 'feeds': [
+    {'name': 'National Geographic', 'base_url': 'https://www.nationalgeographic.com', 'priority': 3, 'feeds': [
         ('https://www.nationalgeographic.com/environment', 'Environment')
     ]},
     
     # India
-    {'name': 'The Hindu', 'base_url': 'https://www.thehindu.com', 'feeds': [
+    {'name': 'The Hindu', 'base_url': 'https://www.thehindu.com', 'priority': 2, 'feeds': [
         ('https://www.thehindu.com/news/national/', 'World'),
         ('https://www.thehindu.com/sci-tech/technology/', 'Technology'),
         ('https://www.thehindu.com/sport/', 'Sports')
+    ], 'syndication': [
+        ('https://www.thehindu.com/news/national/feeder/default.rss', 'World'),
+        ('https://www.thehindu.com/sci-tech/technology/feeder/default.rss', 'Technology'),
+        ('https://www.thehindu.com/sport/feeder/default.rss', 'Sports')
     ]},
     
     # Sports (Powerhouses)
-    {'name': 'ESPN', 'base_url': 'https://www.espn.com', 'feeds': [
+    {'name': 'ESPN', 'base_url': 'https://www.espn.com', 'priority': 1, 'feeds': [
         ('https://www.espn.com/', 'Sports'),
         ('https://www.espn.com/nfl/', 'Sports'),
         ('https://www.espn.com/nba/', 'Sports')
+    ], 'syndication': [
+        ('https://www.espn.com/espn/rss/news', 'Sports'),
+        ('https://www.espn.com/espn/rss/nfl/news', 'Sports'),
+        ('https://www.espn.com/espn/rss/nba/news', 'Sports')
     ]},
-    {'name': 'BBC Sport', 'base_url': 'https://www.bbc.com/sport', 'feeds': [
+    {'name': 'BBC Sport', 'base_url': 'https://www.bbc.com/sport', 'priority': 1, 'feeds': [
         ('https://www.bbc.com/sport', 'Sports'),
         ('https://www.bbc.com/sport/football', 'Sports'),
         ('https://www.bbc.com/sport/cricket', 'Sports')
+    ], 'syndication': [
+        ('https://feeds.bbci.co.uk/sport/rss.xml', 'Sports'),
+        ('https://feeds.bbci.co.uk/sport/football/rss.xml', 'Sports'),
+        ('https://feeds.bbci.co.uk/sport/cricket/rss.xml', 'Sports')
     ]}
 ]
 
 class ScraperV2:
-    def __init__(self):
-        self.session = requests.Session()
-        self.session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    def extract_entries(self, feed_url: str, text: str) -> List[dict]:
+        """FeedEntry JSON for an RSS/Atom feed or sitemap, else the HTML heuristic links (url only)."""
+        if looks_like_feed(text):
+            return [entry.to_json() for entry in parse_feed(text)]
+        return [{'url': link} for link in self.extract_links(feed_url, text)]
 
-    def get_links(self, feed_url: str) -> List[str]:
-        try:
-            logger.info(f"Scraping feed: {feed_url}")
-            r = self.session.get(feed_url, timeout=15)
-            soup = BeautifulSoup(r.text, 'html.parser')
-            links = []
+    def extract_links(self, feed_url: str, html: str) -> List[str]:
+        soup = BeautifulSoup(html, 'html.parser')
+        links = []
+        
+        # Smart link extraction: avoid nav, footer, ads
+        for a in soup.find_all('a', href=True):
+            href = a['href']
+            # Clean and absolute URL
+            if href.startswith('/'):
+                domain = feed_url.split('/')[2]
+                href = f"https://{domain}{href}"
             
-            # Smart link extraction: avoid nav, footer, ads
-            for a in soup.find_all('a', href=True):
-                href = a['href']
-                # Clean and absolute URL
-                if href.startswith('/'):
-                    domain = feed_url.split('/')[2]
-                    href = f"https://{domain}{href}"
-                
-                # Heuristics for news articles: long slugs, no query params, contains keywords
-                if len(href) > 25 and any(ext in href for ext in ['/202', '/news/', '/article/', 'articleshow', '/story/', '/sport/', '/national/']):
-                    links.append(href)
-            
-            return list(set(links))[:20] # Limit per feed to avoid overwhelming
-        except Exception as e:
-            logger.error(f"Failed to scrape feed {feed_url}: {e}")
-            return []
-
-    def parse_article(self, url: str) -> Dict:
-        try:
-            article = NewspaperArticle(url)
-            article.download()
-            article.parse()
-            
-            if len(article.text) < 200:
-                return None
-                
-            return {
-                'title': article.title,
-                'content': article.text,
-                'author': ", ".join(article.authors),
-                'publish_date': article.publish_date or datetime.utcnow(),
-                'image_url': article.top_image,
-                'url': url
-            }
-        except Exception as e:
-            logger.debug(f"Failed to parse {url}: {e}")
-            return None
+            # Heuristics for news articles: long slugs, no query params, contains keywords
+            if len(href) > 25 and any(ext in href for ext in ['/202', '/news/', '/article/', 'articleshow', '/story/', '/sport/', '/national/']):
+                links.append(href)
+        
+        return list(set(links))[:20] # Limit per feed to avoid overwhelming
 
 scraper_v2 = ScraperV2()
@@ -0,0 +1,147 @@
+"""
+Full-text search index over articles.
+
+SQLite gets an external-content FTS5 table kept in sync by triggers, Postgres
+gets a weighted, generated tsvector column with a GIN index. Both are
+maintained by the database itself, so every pipeline insert is searchable
+without the writers having to know about the index.
+"""
+import logging
+import re
+from typing import List, Optional
+
+from sqlalchemy import text, Integer, Float
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+FTS_TABLE = "articles_fts"
+
+# bm25() column weights, in FTS5 column order: title, summary, content, author
+BM25_WEIGHTS = (10.0, 4.0, 1.0, 2.0)
+
+MAX_QUERY_TERMS = 8
+
+SQLITE_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, summary, content, author,
+        content='articles', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, summary, content, author)
+        VALUES (new.id, new.title, new.summary, new.content, new.author);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, summary, content, author)
+        VALUES ('delete', old.id, old.title, old.summary, old.content, old.author);
+    END""",
+    # Only re-index when searchable text changes, not on score/view updates
+    f"""CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, summary, content, author ON articles BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, summary, content, author)
+        VALUES ('delete', old.id, old.title, old.summary, old.content, old.author);
+        INSERT INTO {FTS_TABLE}(rowid, title, summary, content, author)
+        VALUES (new.id, new.title, new.summary, new.content, new.author);
+    END""",
+]
+
+POSTGRES_DDL = [
+    """ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(summary, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(author, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(content, '')), 'D')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING GIN (search_vector)",
+]
+
+# Per-process cache of whether the index exists, keyed by dialect name
+_available = {}
+
+
+def ensure_search_index(engine) -> bool:
+    """Create the dialect's full-text index if missing. Safe to call on every startup."""
+    dialect = engine.dialect.name
+    try:
+        with engine.begin() as conn:
+            if dialect == "sqlite":
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": FTS_TABLE}
+                ).first()
+                for ddl in SQLITE_DDL:
+                    conn.execute(text(ddl))
+                if not exists:
+                    # Backfill rows that were stored before the index existed
+                    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+            elif dialect == "postgresql":
+                for ddl in POSTGRES_DDL:
+                    conn.execute(text(ddl))
+            else:
+                _available[dialect] = False
+                return False
+        _available[dialect] = True
+    except Exception as e:
+        logger.error(f"Full-text index unavailable, falling back to ILIKE search: {e}")
+        _available[dialect] = False
+    return _available[dialect]
+
+
+def is_available(db: Session) -> bool:
+    dialect = db.bind.dialect.name
+    if dialect not in _available:
+        if dialect == "sqlite":
+            found = db.execute(
+                text("SELECT 1 FROM sqlite_master WHERE name = :name"), {"name": FTS_TABLE}
+            ).first()
+        elif dialect == "postgresql":
+            found = db.execute(text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'articles' AND column_name = 'search_vector'"
+            )).first()
+        else:
+            found = None
+        _available[dialect] = found is not None
+    return _available[dialect]
+
+
+def use_memory_backend(db: Session) -> bool:
+    """Whether /articles/search should use the in-process BM25 index."""
+    if settings.SEARCH_BACKEND == "memory":
+        return True
+    if settings.SEARCH_BACKEND == "database":
+        return False
+    return not is_available(db)
+
+
+def query_terms(q: str) -> List[str]:
+    return re.findall(r"\w+", q.lower())[:MAX_QUERY_TERMS]
+
+
+def ranked_matches(db: Session, q: str) -> Optional[object]:
+    """
+    Subquery of (id, rank) for articles matching every term of `q`.
+
+    Terms are prefix-matched so partially typed words still hit. Lower rank
+    is more relevant on both dialects (ts_rank_cd is negated to match bm25).
+    Returns None when the query has no searchable terms.
+    """
+    terms = query_terms(q)
+    if not terms:
+        return None
+
+    if db.bind.dialect.name == "sqlite":
+        match = " ".join(f'"{t}"*' for t in terms)
+        weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+        sql = (
+            f"SELECT rowid AS id, bm25({FTS_TABLE}, {weights}) AS rank "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH :match"
+        )
+    else:
+        match = " & ".join(f"{t}:*" for t in terms)
+        sql = (
+            "SELECT id, -ts_rank_cd(search_vector, to_tsquery('english', :match)) AS rank "
+            "FROM articles WHERE search_vector @@ to_tsquery('english', :match)"
+        )
+    return text(sql).bindparams(match=match).columns(id=Integer, rank=Float).subquery("matches")
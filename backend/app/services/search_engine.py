@@ -0,0 +1,200 @@
+"""
+In-process BM25 search index for Lite Mode deployments.
+
+Used when the database has no full-text extension (see app/services/search.py).
+Postings live in memory, are updated incrementally as articles are saved, and
+are snapshotted to disk so a restart only has to index rows newer than the
+snapshot.
+"""
+import heapq
+import logging
+import math
+import os
+import pickle
+import re
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.article import Article
+
+logger = logging.getLogger(__name__)
+
+# Field boosts: a term in the title counts as much as three in the body
+FIELD_BOOSTS = {"title": 3.0, "summary": 1.5, "content": 1.0}
+
+# Body text beyond this adds memory but almost nothing to ranking
+MAX_CONTENT_CHARS = 10000
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'has', 'in', 'is', 'it',
+    'its', 'of', 'on', 'or', 'that', 'the', 'to', 'was', 'were', 'will', 'with'
+}
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_INTERVAL_SECONDS = 60
+SYNC_BATCH_SIZE = 500
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text:
+        return []
+    return [t for t in re.findall(r"\w+", text.lower()) if t not in STOP_WORDS and len(t) > 1]
+
+
+class InMemorySearchIndex:
+    def __init__(self, snapshot_path: str, k1: float = 1.2, b: float = 0.75):
+        self.snapshot_path = snapshot_path
+        self.k1 = k1
+        self.b = b
+        self.lock = threading.Lock()
+        self.loaded = False
+        self._reset()
+
+    def _reset(self):
+        self.postings: Dict[str, Dict[int, float]] = {}  # term -> {article_id: boosted tf}
+        self.doc_terms: Dict[int, Tuple[str, ...]] = {}  # article_id -> terms, for removal
+        self.doc_len: Dict[int, float] = {}
+        self.total_len = 0.0
+        self.max_synced_id = 0
+        self.dirty = False
+        self.last_snapshot = 0.0
+
+    # --- Maintenance ---
+
+    def _add_locked(self, article_id: int, title: str, summary: str, content: str):
+        if article_id in self.doc_len:
+            self._remove_locked(article_id)
+
+        weighted = Counter()
+        for field, text in (("title", title), ("summary", summary), ("content", (content or "")[:MAX_CONTENT_CHARS])):
+            boost = FIELD_BOOSTS[field]
+            for term in tokenize(text):
+                weighted[term] += boost
+
+        for term, tf in weighted.items():
+            self.postings.setdefault(term, {})[article_id] = tf
+        self.doc_terms[article_id] = tuple(weighted)
+        self.doc_len[article_id] = sum(weighted.values())
+        self.total_len += self.doc_len[article_id]
+        self.dirty = True
+
+    def _remove_locked(self, article_id: int):
+        for term in self.doc_terms.pop(article_id, ()):
+            docs = self.postings.get(term)
+            if docs is not None:
+                docs.pop(article_id, None)
+                if not docs:
+                    del self.postings[term]
+        self.total_len -= self.doc_len.pop(article_id, 0.0)
+        self.dirty = True
+
+    def add(self, article_id: int, title: str, summary: str, content: str):
+        """Pipeline hook: index a freshly committed row if this process serves search (has synced)."""
+        with self.lock:
+            if self.loaded:
+                self._add_locked(article_id, title, summary, content)
+
+    def remove(self, article_id: int):
+        with self.lock:
+            self._remove_locked(article_id)
+
+    def add_article(self, article: Article):
+        self.add(article.id, article.title, article.summary, article.content)
+
+    def sync(self, db: Session, max_batches: Optional[int] = None):
+        """
+        Load the snapshot on first use, then index rows newer than the
+        high-water mark, at most `max_batches` batches of SYNC_BATCH_SIZE.
+        Rows written by other processes (Celery workers) are picked up here,
+        so the add() hook is only a fast path. The API warms the index fully
+        at startup; requests then apply only small deltas.
+        """
+        if not self.loaded:
+            self.load()
+
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            batches += 1
+            rows = db.query(
+                Article.id, Article.title, Article.summary, Article.content
+            ).filter(Article.id > self.max_synced_id).order_by(Article.id).limit(SYNC_BATCH_SIZE).all()
+            if not rows:
+                break
+            with self.lock:
+                for article_id, title, summary, content in rows:
+                    if article_id not in self.doc_len:
+                        self._add_locked(article_id, title, summary, content)
+                self.max_synced_id = rows[-1][0]
+
+        if self.dirty and time.time() - self.last_snapshot > SNAPSHOT_INTERVAL_SECONDS:
+            self.save()
+
+    # --- Persistence ---
+
+    def load(self):
+        with self.lock:
+            self._reset()
+            if os.path.exists(self.snapshot_path):
+                try:
+                    with open(self.snapshot_path, "rb") as f:
+                        state = pickle.load(f)
+                    if state.get("version") == SNAPSHOT_VERSION:
+                        self.postings = state["postings"]
+                        self.doc_terms = state["doc_terms"]
+                        self.doc_len = state["doc_len"]
+                        self.total_len = sum(self.doc_len.values())
+                        self.max_synced_id = state["max_synced_id"]
+                        logger.info(f"Loaded search snapshot with {len(self.doc_len)} articles")
+                except Exception as e:
+                    logger.error(f"Ignoring unreadable search snapshot {self.snapshot_path}: {e}")
+                    self._reset()
+            self.last_snapshot = time.time()
+            self.loaded = True
+
+    def save(self):
+        with self.lock:
+            state = {
+                "version": SNAPSHOT_VERSION,
+                "postings": self.postings,
+                "doc_terms": self.doc_terms,
+                "doc_len": self.doc_len,
+                "max_synced_id": self.max_synced_id,
+            }
+            tmp_path = f"{self.snapshot_path}.tmp"
+            try:
+                with open(tmp_path, "wb") as f:
+                    pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self.snapshot_path)
+                self.dirty = False
+            except Exception as e:
+                logger.error(f"Failed to write search snapshot: {e}")
+            self.last_snapshot = time.time()
+
+    # --- Query ---
+
+    def search(self, q: str, limit: int = 1000) -> List[Tuple[int, float]]:
+        """Top `limit` (article_id, score) pairs by BM25, best first."""
+        terms = set(tokenize(q))
+        with self.lock:
+            n_docs = len(self.doc_len)
+            if not terms or not n_docs:
+                return []
+            avg_len = self.total_len / n_docs
+            scores: Dict[int, float] = {}
+            for term in terms:
+                docs = self.postings.get(term)
+                if not docs:
+                    continue
+                idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+                for article_id, tf in docs.items():
+                    norm = self.k1 * (1 - self.b + self.b * self.doc_len[article_id] / avg_len)
+                    scores[article_id] = scores.get(article_id, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], item[0]))
+
+
+memory_search = InMemorySearchIndex(settings.SEARCH_INDEX_PATH)
@@ -0,0 +1,137 @@
+"""
+Set of already-stored article URLs, checked before anything is fetched.
+
+Backed by a Redis set (SEEN_KEY) when CACHE_REDIS_URL is configured, shared
+by the API and every worker, and always by an in-process scalable Bloom
+filter. Both are warmed from articles.url and caught up by id, like the
+other in-memory indexes. URLs are compared in canonical form
+(app/utils/urls.py).
+
+A Bloom hit may be a false positive (about 0.1%); a miss is certain for
+every URL synced so far, so callers still confirm the misses against the
+database for rows other processes just inserted.
+"""
+import hashlib
+import logging
+import math
+import threading
+from typing import Iterable, List
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.article import Article
+from app.utils.urls import canonicalize_url
+
+logger = logging.getLogger(__name__)
+
+SEEN_KEY = "seen:urls"
+SYNC_BATCH_SIZE = 5000
+
+
+class BloomFilter:
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, int(round(self.size / capacity * math.log(2))))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode("utf-8", "replace"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item: str):
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+
+class ScalableBloomFilter:
+    """Chain of Bloom filters, each twice the size and tighter than the last, so the error rate stays bounded as it grows."""
+
+    def __init__(self, initial_capacity: int = 100_000, error_rate: float = 0.001, tightening: float = 0.5):
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+
+    def add(self, item: str):
+        if not self.filters or self.filters[-1].count >= self.filters[-1].capacity:
+            n = len(self.filters)
+            self.filters.append(BloomFilter(
+                self.initial_capacity * (2 ** n),
+                self.error_rate * (1 - self.tightening) * (self.tightening ** n),
+            ))
+        self.filters[-1].add(item)
+
+    def __contains__(self, item: str) -> bool:
+        return any(item in f for f in reversed(self.filters))
+
+    def __len__(self):
+        return sum(f.count for f in self.filters)
+
+
+class SeenUrls:
+    def __init__(self, redis_url: str = None):
+        self.bloom = ScalableBloomFilter()
+        self.lock = threading.Lock()
+        self.max_synced_id = 0
+        self.redis = None
+        if redis_url and redis is not None:
+            try:
+                self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            except Exception as e:
+                logger.error(f"Seen-URL set running without Redis: {e}")
+
+    def add(self, urls: Iterable[str]):
+        canonical = [canonicalize_url(url) for url in urls]
+        if not canonical:
+            return
+        with self.lock:
+            for url in canonical:
+                self.bloom.add(url)
+        if self.redis is not None:
+            try:
+                self.redis.sadd(SEEN_KEY, *canonical)
+            except Exception as e:
+                logger.warning(f"Redis seen-URL add failed: {e}")
+
+    def sync(self, db: Session):
+        """Warm from articles.url on first use, then add rows newer than the high-water mark."""
+        while True:
+            rows = db.query(Article.id, Article.url).filter(
+                Article.id > self.max_synced_id
+            ).order_by(Article.id).limit(SYNC_BATCH_SIZE).all()
+            if not rows:
+                break
+            self.add(url for _, url in rows if url)
+            self.max_synced_id = rows[-1][0]
+
+    def filter_unseen(self, urls: Iterable[str]) -> List[str]:
+        """`urls` (deduplicated, canonicalized) minus those already stored."""
+        candidates = list(dict.fromkeys(canonicalize_url(url) for url in urls))
+        if not candidates:
+            return []
+        if self.redis is not None:
+            try:
+                flags = self.redis.smismember(SEEN_KEY, candidates)
+                return [url for url, seen in zip(candidates, flags) if not seen]
+            except Exception as e:
+                logger.warning(f"Redis seen-URL lookup failed, using Bloom filter: {e}")
+        with self.lock:
+            return [url for url in candidates if url not in self.bloom]
+
+
+# Singleton instance
+seen_urls = SeenUrls(redis_url=settings.CACHE_REDIS_URL or None)
@@ -0,0 +1,119 @@
+"""
+Lexical near-duplicate index for Lite Mode.
+
+Keeps the SimHash fingerprints (Article.simhash) of the last WINDOW_HOURS
+of articles in BANDS bucket tables keyed by 8-bit slices. Two fingerprints
+within MAX_DISTANCE bits must agree exactly on at least one slice
+(pigeonhole), so a lookup only compares against the few fingerprints
+sharing a bucket. Loaded and caught up from the database like the
+embedding index, so it survives restarts and sees other workers' inserts.
+"""
+import logging
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.models.article import Article
+from app.services.embedding_index import utc_naive
+from app.utils.simhash import from_signed, hamming
+
+logger = logging.getLogger(__name__)
+
+WINDOW_HOURS = 48
+SYNC_BATCH_SIZE = 2000
+BANDS = 8
+BAND_BITS = 64 // BANDS
+BAND_MASK = (1 << BAND_BITS) - 1
+MAX_DISTANCE = 6  # must stay below BANDS for the bucket lookup to be exact
+
+
+def _bands(signature: int) -> Iterable[Tuple[int, int]]:
+    return ((band, (signature >> (band * BAND_BITS)) & BAND_MASK) for band in range(BANDS))
+
+
+class SimHashIndex:
+    def __init__(self, window_hours: int = WINDOW_HOURS, max_distance: int = MAX_DISTANCE):
+        self.window = timedelta(hours=window_hours)
+        self.max_distance = max_distance
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.max_synced_id = 0
+        self.signatures: Dict[int, Tuple[int, datetime]] = {}  # article_id -> (signature, created_at)
+        self.buckets = [defaultdict(set) for _ in range(BANDS)]  # band value -> {article_id}
+
+    def _add_locked(self, article_id: int, signature: int, created_at: Optional[datetime]):
+        if article_id in self.signatures:
+            return
+        self.signatures[article_id] = (signature, utc_naive(created_at))
+        for band, value in _bands(signature):
+            self.buckets[band][value].add(article_id)
+
+    def _remove_locked(self, article_id: int):
+        signature, _ = self.signatures.pop(article_id)
+        for band, value in _bands(signature):
+            bucket = self.buckets[band].get(value)
+            if bucket is not None:
+                bucket.discard(article_id)
+                if not bucket:
+                    del self.buckets[band][value]
+
+    def _prune_locked(self):
+        cutoff = datetime.utcnow() - self.window
+        for article_id in [i for i, (_, created_at) in self.signatures.items() if created_at < cutoff]:
+            self._remove_locked(article_id)
+
+    def add(self, article_id: int, signature: int, created_at: Optional[datetime] = None):
+        if not self.loaded or not signature:
+            return
+        with self.lock:
+            self._add_locked(article_id, signature, created_at)
+
+    def sync(self, db: Session):
+        """Warm-load the window on first use, then pick up rows newer than the high-water mark."""
+        cutoff = datetime.utcnow() - self.window
+        while True:
+            rows = db.query(Article.id, Article.simhash, Article.created_at).filter(
+                Article.id > self.max_synced_id,
+                Article.created_at >= cutoff,
+                Article.simhash.isnot(None),
+            ).order_by(Article.id).limit(SYNC_BATCH_SIZE).all()
+            if not rows:
+                break
+            with self.lock:
+                for article_id, signature, created_at in rows:
+                    if signature:
+                        self._add_locked(article_id, from_signed(signature), created_at)
+                self.max_synced_id = max(self.max_synced_id, rows[-1][0])
+        with self.lock:
+            self._prune_locked()
+            if not self.loaded:
+                logger.info(f"SimHash index warm-loaded with {len(self.signatures)} fingerprints")
+            self.loaded = True
+
+    def find_near(self, signature: int) -> Optional[int]:
+        """Id of a stored article within max_distance bits of `signature`, if any."""
+        if not signature:
+            return None
+        with self.lock:
+            candidates: Set[int] = set()
+            for band, value in _bands(signature):
+                candidates.update(self.buckets[band].get(value, ()))
+            for article_id in candidates:
+                if hamming(signature, self.signatures[article_id][0]) <= self.max_distance:
+                    return article_id
+        return None
+
+    def is_duplicate(self, signature: int, pending: Iterable[int] = ()) -> bool:
+        if self.find_near(signature) is not None:
+            return True
+        return any(hamming(signature, other) <= self.max_distance for other in pending if other)
+
+    def __len__(self):
+        return len(self.signatures)
+
+
+# Singleton instance
+simhash_index = SimHashIndex()
@@ -0,0 +1,101 @@
+"""
+Adaptive per-source crawl intervals.
+
+Every discovery run records how many new links a source yielded
+(app/models/crawl.py SourceSchedule). The interval then follows the
+source's smoothed publish rate, aiming at about TARGET_NEW_PER_CRAWL new
+links per crawl. Sources that yield nothing back off exponentially, and
+failing sources back off exponentially on top of that. Sources start from
+the interval of their configured priority.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models.crawl import SourceSchedule
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERVALS = {1: 300.0, 2: 900.0, 3: 3600.0}
+MIN_INTERVAL_SECONDS = 120.0
+MAX_INTERVAL_SECONDS = 6 * 3600.0
+TARGET_NEW_PER_CRAWL = 5
+RATE_SMOOTHING = 0.3  # weight of the latest crawl in the publish-rate average
+IDLE_BACKOFF = 2.0
+
+
+def _clamp(interval: float) -> float:
+    return max(MIN_INTERVAL_SECONDS, min(MAX_INTERVAL_SECONDS, interval))
+
+
+class SourceScheduler:
+    def _rows(self, db: Session, configs: List[dict]) -> dict:
+        rows = {row.name: row for row in db.query(SourceSchedule).filter(
+            SourceSchedule.name.in_([c['name'] for c in configs])
+        )}
+        now = datetime.utcnow()
+        for config in configs:
+            if config['name'] not in rows:
+                row = SourceSchedule(
+                    name=config['name'],
+                    interval_seconds=PRIORITY_INTERVALS.get(config.get('priority'), PRIORITY_INTERVALS[2]),
+                    next_run_at=now, last_new=0, idle_runs=0, consecutive_errors=0,
+                )
+                db.add(row)
+                rows[config['name']] = row
+        return rows
+
+    def claim_due(self, db: Session, configs: List[dict]) -> List[dict]:
+        """
+        Configs whose next run time has passed. Their next run is pushed one
+        interval ahead, so a crawl still in flight is not dispatched again;
+        record() then sets the real next run.
+        """
+        rows = self._rows(db, configs)
+        now = datetime.utcnow()
+        due = []
+        for config in configs:
+            row = rows[config['name']]
+            if row.next_run_at is None or row.next_run_at <= now:
+                row.next_run_at = now + timedelta(seconds=row.interval_seconds)
+                due.append(config)
+        db.commit()
+        return due
+
+    def record(self, db: Session, config: dict, new_links: int, error: Optional[str] = None):
+        """Fold one crawl's outcome into the source's interval and schedule its next run."""
+        row = self._rows(db, [config])[config['name']]
+        now = datetime.utcnow()
+
+        if error:
+            row.consecutive_errors = (row.consecutive_errors or 0) + 1
+            row.last_error = error[:500]
+            delay = _clamp(row.interval_seconds * (2 ** row.consecutive_errors))
+        else:
+            if row.last_run_at is not None:
+                # The first crawl returns the whole backlog, so it does not count toward the rate
+                hours = max((now - row.last_run_at).total_seconds(), 1.0) / 3600
+                observed = new_links / hours
+                row.rate_per_hour = observed if row.rate_per_hour is None else (
+                    RATE_SMOOTHING * observed + (1 - RATE_SMOOTHING) * row.rate_per_hour
+                )
+            row.idle_runs = 0 if new_links else (row.idle_runs or 0) + 1
+            if row.idle_runs:
+                row.interval_seconds = _clamp(row.interval_seconds * IDLE_BACKOFF)
+            elif row.rate_per_hour:
+                row.interval_seconds = _clamp(TARGET_NEW_PER_CRAWL * 3600 / row.rate_per_hour)
+            row.consecutive_errors = 0
+            row.last_error = None
+            delay = row.interval_seconds
+
+        row.last_new = new_links
+        row.last_run_at = now
+        row.next_run_at = now + timedelta(seconds=delay)
+        db.commit()
+        logger.info(f"{config['name']}: {new_links} new, next crawl in {delay / 60:.1f} min")
+
+
+# Singleton instance
+source_scheduler = SourceScheduler()
@@ -0,0 +1,201 @@
+"""
+Streaming stage runner for the ingestion pipelines.
+
+A StreamPipeline is a chain of Stages joined by bounded asyncio queues.
+Every stage runs its own workers, so all stages overlap. A full queue
+blocks the stage feeding it (back-pressure), and memory is bounded by
+queue size times stage count however many links a run discovers.
+
+A stage function takes one item (or a list, for batching stages) and
+returns the items to pass on: none to drop it, several to fan out.
+Exceptions are counted per stage and the item is dropped.
+
+Per-stage counters of the latest run of each pipeline are kept in
+`pipeline_stats`. They are shared through CACHE_REDIS_URL when set, so
+the API can show runs from the Celery workers.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "pipeline:stats:"
+STATS_TTL_SECONDS = 24 * 3600
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[Any], Awaitable[Iterable[Any]]]
+    workers: int = 1
+    batch_size: Optional[int] = None  # set to hand `fn` lists of up to this many items
+    max_wait: float = 0.5  # seconds a partial batch waits for more items
+
+
+@dataclass
+class StageStats:
+    name: str
+    workers: int
+    received: int = 0
+    emitted: int = 0
+    dropped: int = 0  # items that produced no output
+    errors: int = 0
+    busy_seconds: float = 0.0  # summed over workers
+    max_queue: int = 0  # deepest input queue seen
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+
+    def as_dict(self) -> dict:
+        elapsed = (self.finished_at or time.time()) - self.started_at
+        data = asdict(self)
+        data['busy_seconds'] = round(self.busy_seconds, 3)
+        data['elapsed_seconds'] = round(elapsed, 3)
+        data['items_per_second'] = round(self.received / elapsed, 2) if elapsed > 0 else None
+        return data
+
+
+class StreamPipeline:
+    def __init__(self, name: str, stages: List[Stage], queue_size: int = None):
+        self.name = name
+        self.stages = stages
+        self.queue_size = queue_size or settings.PIPELINE_QUEUE_SIZE
+        self.stats = [StageStats(stage.name, stage.workers) for stage in stages]
+
+    async def _next_batch(self, stage: Stage, inq: asyncio.Queue):
+        """Up to batch_size items, waiting at most max_wait after the first. Returns (items, saw_done)."""
+        first = await inq.get()
+        if first is _DONE:
+            return [], True
+        items = [first]
+        deadline = time.monotonic() + stage.max_wait
+        while len(items) < stage.batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(inq.get(), remaining)
+            except asyncio.TimeoutError:
+                break
+            if item is _DONE:
+                return items, True
+            items.append(item)
+        return items, False
+
+    async def _worker(self, stage: Stage, stats: StageStats, inq: asyncio.Queue, outq: Optional[asyncio.Queue]):
+        while True:
+            stats.max_queue = max(stats.max_queue, inq.qsize())
+            if stage.batch_size:
+                items, done = await self._next_batch(stage, inq)
+                payload = items
+            else:
+                item = await inq.get()
+                done = item is _DONE
+                items = [] if done else [item]
+                payload = item
+            if items:
+                started = time.monotonic()
+                try:
+                    outputs = list(await stage.fn(payload) or ())
+                except Exception as e:
+                    logger.error(f"{self.name}/{stage.name} failed on {len(items)} item(s): {e!r}")
+                    stats.errors += len(items)
+                    outputs = []
+                stats.busy_seconds += time.monotonic() - started
+                stats.received += len(items)
+                stats.emitted += len(outputs)
+                if not outputs:
+                    stats.dropped += len(items)
+                if outq is not None:
+                    for output in outputs:
+                        await outq.put(output)
+            if done:
+                # Let this stage's other workers see the end of input too
+                await inq.put(_DONE)
+                return
+
+    async def _run_stage(self, index: int, queues: List[asyncio.Queue]):
+        stage, stats = self.stages[index], self.stats[index]
+        outq = queues[index + 1] if index + 1 < len(queues) else None
+        await asyncio.gather(*(self._worker(stage, stats, queues[index], outq) for _ in range(stage.workers)))
+        stats.finished_at = time.time()
+        if outq is not None:
+            await outq.put(_DONE)
+
+    async def _feed(self, source: Union[Iterable, AsyncIterable], inq: asyncio.Queue):
+        if hasattr(source, '__aiter__'):
+            async for item in source:
+                await inq.put(item)
+        else:
+            for item in source:
+                await inq.put(item)
+        await inq.put(_DONE)
+
+    async def run(self, source: Union[Iterable, AsyncIterable]) -> List[StageStats]:
+        """Push every item of `source` through the stages; returns the per-stage counters."""
+        queues = [asyncio.Queue(maxsize=self.queue_size) for _ in self.stages]
+        tasks = [asyncio.ensure_future(self._feed(source, queues[0]))]
+        tasks += [asyncio.ensure_future(self._run_stage(i, queues)) for i in range(len(self.stages))]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            pipeline_stats.record(self.name, self.stats)
+        return self.stats
+
+
+class PipelineStats:
+    def __init__(self, redis_url: str = None):
+        self.latest: Dict[str, dict] = {}
+        self.lock = threading.Lock()
+        self.redis = None
+        if redis_url and redis is not None:
+            try:
+                self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            except Exception as e:
+                logger.error(f"Pipeline stats running without Redis: {e}")
+
+    def record(self, name: str, stats: List[StageStats]):
+        run = {'pipeline': name, 'finished_at': time.time(), 'stages': [s.as_dict() for s in stats]}
+        logger.info(f"{name} pipeline: " + ", ".join(
+            f"{s['name']} {s['received']}->{s['emitted']} ({s['items_per_second']}/s)" for s in run['stages']
+        ))
+        with self.lock:
+            self.latest[name] = run
+        if self.redis is not None:
+            try:
+                self.redis.set(STATS_KEY + name, json.dumps(run), ex=STATS_TTL_SECONDS)
+            except Exception as e:
+                logger.warning(f"Redis pipeline stats write failed: {e}")
+
+    def snapshot(self) -> Dict[str, dict]:
+        """Latest run of each pipeline, from every process when Redis is configured."""
+        with self.lock:
+            runs = dict(self.latest)
+        if self.redis is not None:
+            try:
+                for key in self.redis.scan_iter(match=STATS_KEY + "*"):
+                    run = json.loads(self.redis.get(key) or "null")
+                    if run and run['finished_at'] > runs.get(run['pipeline'], {}).get('finished_at', 0):
+                        runs[run['pipeline']] = run
+            except Exception as e:
+                logger.warning(f"Redis pipeline stats read failed: {e}")
+        return runs
+
+
+# Singleton instance
+pipeline_stats = PipelineStats(redis_url=settings.CACHE_REDIS_URL or None)
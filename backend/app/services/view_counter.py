@@ -0,0 +1,124 @@
+"""
+Buffered article view counting.
+
+Reads only bump an in-memory (or Redis, when CACHE_REDIS_URL is set) counter.
+A background flusher drains the buffer every few seconds and applies it with
+one batched UPDATE, adding a log-damped popularity boost to feed_score.
+"""
+import asyncio
+import logging
+import math
+import threading
+import uuid
+from collections import Counter
+from typing import Dict, Optional
+
+try:
+    import redis
+except ImportError:
+    redis = None
+
+from sqlalchemy import bindparam, func, update
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.article import Article
+
+logger = logging.getLogger(__name__)
+
+PENDING_KEY = "views:pending"
+
+
+class ViewCounter:
+    def __init__(self, redis_url: Optional[str] = None, flush_interval: float = 5.0, score_weight: float = 2.0):
+        self.flush_interval = flush_interval
+        self.score_weight = score_weight
+        self.pending = Counter()
+        self.lock = threading.Lock()
+        self.redis = None
+        if redis_url and redis is not None:
+            try:
+                self.redis = redis.Redis.from_url(redis_url, socket_timeout=0.5)
+            except Exception as e:
+                logger.error(f"View counter running without Redis: {e}")
+
+    def record(self, article_id: int):
+        if self.redis is not None:
+            try:
+                self.redis.hincrby(PENDING_KEY, article_id, 1)
+                return
+            except Exception as e:
+                logger.warning(f"Redis view increment failed, buffering locally: {e}")
+        with self.lock:
+            self.pending[article_id] += 1
+
+    def drain(self) -> Dict[int, int]:
+        with self.lock:
+            counts, self.pending = self.pending, Counter()
+        if self.redis is not None:
+            # Move the shared hash aside atomically so concurrent flushers never double-apply
+            flushing_key = f"views:flushing:{uuid.uuid4().hex}"
+            try:
+                self.redis.rename(PENDING_KEY, flushing_key)
+                for article_id, n in self.redis.hgetall(flushing_key).items():
+                    counts[int(article_id)] += int(n)
+                self.redis.delete(flushing_key)
+            except redis.ResponseError:
+                pass  # nothing pending
+            except Exception as e:
+                logger.warning(f"Redis view drain failed: {e}")
+        return dict(counts)
+
+    def flush(self) -> int:
+        """Apply buffered views in one round of batched UPDATEs. Returns the number of articles touched."""
+        counts = self.drain()
+        if not counts:
+            return 0
+
+        db = SessionLocal()
+        try:
+            current = dict(db.query(Article.id, Article.view_count).filter(Article.id.in_(list(counts))).all())
+            rows = []
+            for article_id, n in counts.items():
+                if article_id not in current:
+                    continue
+                before = current[article_id] or 0
+                rows.append({
+                    "b_id": article_id,
+                    "b_views": n,
+                    "b_boost": self.score_weight * (math.log1p(before + n) - math.log1p(before)),
+                })
+            if rows:
+                stmt = update(Article).where(Article.id == bindparam("b_id")).values(
+                    view_count=func.coalesce(Article.view_count, 0) + bindparam("b_views"),
+                    feed_score=func.coalesce(Article.feed_score, 0) + bindparam("b_boost"),
+                    # A view is not an edit; keep onupdate from bumping updated_at
+                    updated_at=Article.updated_at,
+                )
+                db.connection().execute(stmt, rows)
+                db.commit()
+            return len(rows)
+        except Exception as e:
+            logger.error(f"View flush failed, requeueing {len(counts)} articles: {e}")
+            db.rollback()
+            with self.lock:
+                self.pending.update(counts)
+            return 0
+        finally:
+            db.close()
+
+    async def run(self):
+        """Background loop started with the API; flushes off the request path."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"View flusher error: {e}")
+
+
+view_counter = ViewCounter(
+    redis_url=settings.CACHE_REDIS_URL or None,
+    flush_interval=settings.VIEW_FLUSH_INTERVAL_SECONDS,
+    score_weight=settings.VIEW_SCORE_WEIGHT,
+)
@@ -1,7 +1,11 @@
+import asyncio
 import logging
 from app.worker import celery_app
 from app.services.scraper_v2 import SCRAPER_CONFIG
-from app.services.pipeline_v2 import run_premium_source_scrape
+from app.services.frontier import frontier
+from app.services.source_scheduler import source_scheduler
+from app.services.pipeline_v2 import discover_sources, run_frontier_crawl, run_premium_source_scrape
+from app.core.config import settings
 from app.db.session import SessionLocal
 from app.models.article import Article, TrendingTopic
 from sqlalchemy import func
@@ -10,34 +14,62 @@ from datetime import datetime, timedelta
 logger = logging.getLogger(__name__)
 
 @celery_app.task(name="app.tasks.scheduler.schedule_scraping")
-def schedule_scraping(priority: int):
+def schedule_scraping(priority: int = None):
     """
-    Priority 1: Breaking News sources (Reuters, AP, Bloomberg)
-    Priority 2: Category specific (TechCrunch, Wired, Nature)
-    Priority 3: Deep Dives / Local (The Hindu, EdSurge)
+    Dispatch discovery for every source whose adaptive crawl interval has
+    elapsed (app/services/source_scheduler.py). With `priority`, dispatch
+    all sources of that priority now:
+    Priority 1: Breaking news wires (Reuters, AP, Bloomberg, BBC Sport, ESPN)
+    Priority 2: Category specialists (VentureBeat AI, Nature, New Scientist, ...)
+    Priority 3: Slow / deep dives (EdSurge, Inside Higher Ed, Grist, ...)
     """
-    priority_mapping = {
-        1: ['Reuters', 'Associated Press', 'Bloomberg', 'CNN', 'BBC'],
-        2: ['TechCrunch', 'The Verge', 'Wired', 'Nature', 'Science Daily', 'Bloomberg'],
-        3: ['EdSurge', 'Medical News Today', 'The Hindu', 'NDTV', 'Hacker News']
-    }
-    
-    selected_sources = priority_mapping.get(priority, [])
-    
-    total_new = 0
-    for config in SCRAPER_CONFIG:
-        if config['name'] in selected_sources:
-            logger.info(f"Triggering scrape for {config['name']}")
-            # Use delay to run in parallel workers
-            scrape_source_task.delay(config)
-    
-    return f"Scheduled {len(selected_sources)} sources for priority {priority}"
+    if priority is not None:
+        selected = [config for config in SCRAPER_CONFIG if config.get('priority') == priority]
+    else:
+        db = SessionLocal()
+        try:
+            selected = source_scheduler.claim_due(db, SCRAPER_CONFIG)
+        finally:
+            db.close()
+
+    for config in selected:
+        logger.info(f"Triggering discovery for {config['name']}")
+        # Discovery only queues links; crawl_frontier_task workers fetch them
+        discover_source_task.delay(config)
+
+    return f"Scheduled {len(selected)} sources"
 
 @celery_app.task(name="app.tasks.scraper.scrape_source_task")
 def scrape_source_task(source_config: dict):
     """Worker task to scrape a single source"""
     return run_premium_source_scrape(source_config)
 
+@celery_app.task(name="app.tasks.scraper.discover_source_task")
+def discover_source_task(source_config: dict):
+    """Worker task to queue a source's new links in the crawl frontier"""
+    return asyncio.run(discover_sources([source_config]))[source_config['name']]
+
+@celery_app.task(name="app.tasks.scheduler.schedule_frontier_crawl")
+def schedule_frontier_crawl():
+    """Start FRONTIER_CRAWL_TASKS crawl tasks; each keeps leasing batches for up to a minute."""
+    for _ in range(settings.FRONTIER_CRAWL_TASKS):
+        crawl_frontier_task.delay()
+    return f"Started {settings.FRONTIER_CRAWL_TASKS} frontier crawls"
+
+@celery_app.task(name="app.tasks.scraper.crawl_frontier_task")
+def crawl_frontier_task():
+    """Worker task to lease and crawl frontier batches until nothing is due or its time budget is spent"""
+    return run_frontier_crawl(settings.FRONTIER_BATCH_SIZE, settings.FRONTIER_TASK_SECONDS)
+
+@celery_app.task(name="app.tasks.scraper.prune_frontier_task")
+def prune_frontier_task():
+    """Delete frontier entries finished more than a week ago"""
+    db = SessionLocal()
+    try:
+        return f"Pruned {frontier.prune(db)} frontier entries"
+    finally:
+        db.close()
+
 @celery_app.task(name="app.tasks.analysis.analyze_trends_task")
 def analyze_trends_task():
     """
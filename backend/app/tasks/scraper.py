@@ -6,6 +6,12 @@ from app.models.article import Article
 from ml.quality import calculate_quality_score
 from ml.cleaner import clean_text
 from ml import predict
+from app.services.categories import canonical_category, category_name
+from app.services.bulk import bulk_insert_articles
+from app.services.host_health import host_health
+from app.services.seen_urls import seen_urls
+from app.utils.simhash import simhash, to_signed
+from app.utils.slugs import make_slug
 import logging
 from datetime import datetime
 from urllib.parse import quote
@@ -20,8 +26,12 @@ def scrape_source_task(source_name: str):
     source_config = next((s for s in SOURCES if s.name == source_name), None)
     if not source_config: return
     
-    links = engine.discover_links(source_config)
-    process_links(links, source_config)
+    host_health.load()
+    try:
+        links = engine.discover_links(source_config)
+        process_links(links, source_config)
+    finally:
+        host_health.save()
 
 @celery_app.task
 def crawl_keywords_task():
@@ -29,6 +39,7 @@ def crawl_keywords_task():
     Crawl for specific high-value keywords across major search-friendly publishers.
     """
     db = SessionLocal()
+    host_health.load()
     # Major publishers that support simple query params
     SEARCHABLE_SOURCES = [
         {"name": "BBC Search", "url": "https://www.bbc.co.uk/search?q=", "category": "World"},
@@ -47,45 +58,54 @@ def crawl_keywords_task():
             links = engine.discover_links(fake_config)
             process_links(links, fake_config)
             
+    host_health.save()
     db.close()
 
 def process_links(links, source_config):
     db = SessionLocal()
-    new_count = 0
+    seen_urls.sync(db)
+    # Reject already-stored links in memory, confirm the rest with one IN query
+    unseen = seen_urls.filter_unseen(links)
+    existing = {url for (url,) in db.query(Article.url).filter(Article.url.in_(unseen))} if unseen else set()
+    links = [url for url in unseen if url not in existing]
+    rows = []
     
-    for url in links:
-        exists = db.query(Article).filter(Article.url == url).first()
-        if exists: continue
-            
-        data = engine.fetch_article_content(url)
+    # Downloads run concurrently; extraction streams back from the process pool
+    for url, data in engine.fetch_many(links):
         if not data: continue
             
         q_score = calculate_quality_score(data)
         if q_score < 4.0: continue
             
-        category = predict.predict_topic(data['content']) or source_config.category
+        category_slug = canonical_category(predict.predict_topic(data['content']) or source_config.category)
         is_cb = predict.predict_clickbait(data['title'])
+        title = clean_text(data['title'])
         
-        article = Article(
-            title=clean_text(data['title']),
-            content=clean_text(data['content']),
-            url=url,
-            image_url=data['image'],
-            source=source_config.name,
-            region=getattr(source_config, 'region', 'Global'),
-            publish_date=data['publish_date'],
-            category=category,
-            quality_score=q_score,
-            feed_score=q_score,
-            is_clickbait=is_cb
-        )
-        
-        try:
-            db.add(article)
-            db.commit()
-            new_count += 1
-        except Exception:
-            db.rollback()
+        rows.append({
+            'title': title,
+            'slug': make_slug(title, url),
+            'content': clean_text(data['content']),
+            'url': url,
+            'image_url': data['image'],
+            'source': source_config.name,
+            'region': getattr(source_config, 'region', 'Global'),
+            'publish_date': data['publish_date'],
+            'category': category_name(category_slug),
+            'category_slug': category_slug,
+            'quality_score': q_score,
+            'feed_score': q_score,
+            'is_clickbait': is_cb,
+            'simhash': to_signed(simhash(f"{title}\n{data['content']}"))
+        })
+    
+    new_count = 0
+    try:
+        new_count = len(bulk_insert_articles(db, rows))
+        seen_urls.add(row['url'] for row in rows)
+    except Exception as e:
+        logger.error(f"Bulk insert failed for {source_config.name}: {e}")
+        db.rollback()
             
     db.close()
-    logger.info(f"Processed {len(links)} links for {source_config.name}, added {new_count}")
+    logger.info(f"Processed {len(links)} new links for {source_config.name}: "
+                f"{len(rows)} candidates, added {new_count}")
@@ -0,0 +1,9 @@
+import hashlib
+import re
+
+
+def make_slug(title: str, url: str) -> str:
+    """URL-safe slug from the title, suffixed with a short URL hash so it stays unique."""
+    base = re.sub(r"[^a-z0-9]+", "-", (title or "").lower()).strip("-")[:80].rstrip("-")
+    digest = hashlib.sha1(url.encode()).hexdigest()[:8]
+    return f"{base}-{digest}" if base else digest
@@ -0,0 +1,37 @@
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# Query parameters that only track the referrer and never change the page
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'cmpid', 'ocid', 'ref', 'ref_src', 'src', 'smid', 'taid', 'at_medium', 'at_campaign',
+}
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Stable form of an article URL for dedup: lower-cased scheme and host,
+    no default port, fragment, utm_*/tracking parameters or trailing slash.
+    """
+    url = (url or '').strip()
+    try:
+        parts = urlsplit(url)
+        port = parts.port  # parsed lazily; raises on a non-numeric or out-of-range port
+    except ValueError:
+        return url
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or '').lower()
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+
+    query = urlencode([
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+    ])
+    path = parts.path.rstrip('/') or '/'
+    if path == '/' and not query:
+        path = ''
+    return urlunsplit((scheme, host, path, query, ''))
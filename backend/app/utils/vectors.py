@@ -0,0 +1,58 @@
+"""
+Compact binary encoding for article embeddings.
+
+Layout: 4-byte header (magic "E", format version, dtype code, reserved),
+then for int8 a little-endian float32 scale, then the raw little-endian
+vector. decode_embedding() returns a read-only view over the blob via
+np.frombuffer, so float32/float16 blobs decode without copying.
+"""
+import struct
+from typing import Sequence, Union
+
+import numpy as np
+
+MAGIC = ord("E")
+FORMAT_VERSION = 1
+
+DTYPES = {
+    "float32": (1, np.dtype("<f4")),
+    "float16": (2, np.dtype("<f2")),
+    "int8": (3, np.dtype("i1")),
+}
+DTYPE_BY_CODE = {code: (name, dtype) for name, (code, dtype) in DTYPES.items()}
+
+HEADER = struct.Struct("<BBBx")
+SCALE = struct.Struct("<f")
+
+
+def encode_embedding(embedding: Sequence[float], dtype: str = "float16") -> bytes:
+    if dtype not in DTYPES:
+        raise ValueError(f"Unsupported embedding dtype: {dtype}")
+    code, np_dtype = DTYPES[dtype]
+    vector = np.asarray(embedding, dtype=np.float32).ravel()
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, code)
+
+    if dtype == "int8":
+        # Symmetric per-vector quantization: value ~= q * scale
+        peak = float(np.abs(vector).max()) if vector.size else 0.0
+        scale = peak / 127.0 if peak > 0 else 1.0
+        quantized = np.clip(np.rint(vector / scale), -127, 127).astype(np_dtype)
+        return header + SCALE.pack(scale) + quantized.tobytes()
+    return header + vector.astype(np_dtype).tobytes()
+
+
+def decode_embedding(blob: Union[bytes, memoryview]) -> np.ndarray:
+    """
+    Vector stored in `blob`. float32 and float16 come back as zero-copy
+    views in their stored dtype; int8 is dequantized to float32.
+    """
+    magic, version, code = HEADER.unpack_from(blob)
+    if magic != MAGIC or version != FORMAT_VERSION or code not in DTYPE_BY_CODE:
+        raise ValueError("Not an encoded embedding")
+    name, np_dtype = DTYPE_BY_CODE[code]
+
+    if name == "int8":
+        (scale,) = SCALE.unpack_from(blob, HEADER.size)
+        quantized = np.frombuffer(blob, dtype=np_dtype, offset=HEADER.size + SCALE.size)
+        return quantized.astype(np.float32) * np.float32(scale)
+    return np.frombuffer(blob, dtype=np_dtype, offset=HEADER.size)
@@ -21,26 +21,26 @@ celery_app.conf.update(
     enable_utc=True,
     task_routes={
         "app.tasks.scraper.scrape_source_task": {"queue": "scraper"},
+        "app.tasks.scraper.discover_source_task": {"queue": "scraper"},
+        "app.tasks.scraper.crawl_frontier_task": {"queue": "scraper"},
+        "app.tasks.scraper.prune_frontier_task": {"queue": "scraper"},
         "app.tasks.analysis.analyze_trends_task": {"queue": "analysis"},
     },
 )
 
 # Celery Beat Schedule for Periodic Tasks
 celery_app.conf.beat_schedule = {
-    "scrape-breaking-news-every-5-mins": {
+    "schedule-due-sources-every-minute": {
         "task": "app.tasks.scheduler.schedule_scraping",
-        "schedule": 300.0, # 5 minutes
-        "args": (1,) # Priority 1
+        "schedule": 60.0, # only dispatches sources whose adaptive interval has elapsed
     },
-    "scrape-general-news-every-15-mins": {
-        "task": "app.tasks.scheduler.schedule_scraping",
-        "schedule": 900.0, # 15 minutes
-        "args": (2,) # Priority 2
+    "crawl-frontier-every-minute": {
+        "task": "app.tasks.scheduler.schedule_frontier_crawl",
+        "schedule": 60.0, # starts FRONTIER_CRAWL_TASKS crawls; raise it (and scraper workers) to crawl faster
     },
-    "scrape-deep-dives-every-hour": {
-        "task": "app.tasks.scheduler.schedule_scraping",
+    "prune-frontier-every-hour": {
+        "task": "app.tasks.scraper.prune_frontier_task",
         "schedule": 3600.0, # 1 hour
-        "args": (3,) # Priority 3
     },
     "update-trending-topics": {
         "task": "app.tasks.analysis.analyze_trends_task",
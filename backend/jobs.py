@@ -1,8 +1,9 @@
 import asyncio
 import logging
 from app.db.session import engine, Base
+from app.services.search import ensure_search_index
 from app.services.scraper_v2 import SCRAPER_CONFIG
-from app.services.pipeline_v2 import run_premium_source_scrape
+from app.services.pipeline_v2 import scrape_sources
 from datetime import datetime
 
 # Configure logging
@@ -13,6 +14,7 @@ def init_db():
     """Ensure all database tables are created."""
     logger.info("Initializing database...")
     Base.metadata.create_all(bind=engine)
+    ensure_search_index(engine)
 
 async def run_scraper_loop(interval_min=15):
     """Background task that runs the premium news engine periodically."""
@@ -23,12 +25,9 @@ async def run_scraper_loop(interval_min=15):
             scrape_count += 1
             logger.info(f"Starting Newsroom Ingestion Cycle #{scrape_count} at {datetime.now()}")
             
-            # Run the V2 pipeline for all sources
-            total_added = 0
-            for config in SCRAPER_CONFIG:
-                logger.info(f"Scraping source: {config['name']}")
-                count = await asyncio.to_thread(run_premium_source_scrape, config)
-                total_added += count
+            # Run the V2 pipeline for all sources concurrently
+            added = await scrape_sources(SCRAPER_CONFIG)
+            total_added = sum(added.values())
             
             logger.info(f"Cycle #{scrape_count} complete. Added {total_added} high-quality articles.")
         except Exception as e:
@@ -1,18 +1,150 @@
-from app.db.session import engine
-from sqlalchemy import text
+from app.db.session import engine, Base
+from app.models import article, crawl  # noqa: F401 - register tables for create_all
+from app.services.search import ensure_search_index
+from app.services.categories import canonical_category, category_name
+from app.core.config import settings
+from app.utils.simhash import simhash, to_signed
+from app.utils.vectors import encode_embedding
+from sqlalchemy import LargeBinary, bindparam, text
+import json
+
+def add_column(conn, name, ddl_type, table="articles"):
+    print(f"Checking for column '{name}' in '{table}'...")
+    try:
+        conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {name} {ddl_type}"))
+        conn.commit()
+        print(f"Successfully added '{name}' column.")
+    except Exception as e:
+        conn.rollback()
+        if "already exists" in str(e).lower() or "duplicate column" in str(e).lower():
+            print(f"Column '{name}' already exists.")
+        else:
+            print(f"Migration error: {e}")
+
+def create_index(conn, name, ddl):
+    print(f"Ensuring index '{name}'...")
+    try:
+        conn.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {ddl}"))
+        conn.commit()
+        print("Index ready.")
+    except Exception as e:
+        conn.rollback()
+        print(f"Migration error: {e}")
+
+def backfill_category_slugs(conn):
+    """Canonicalize legacy category labels and fill category_slug."""
+    print("Backfilling canonical categories...")
+    labels = [row[0] for row in conn.execute(text(
+        "SELECT DISTINCT category FROM articles WHERE category_slug IS NULL"
+    ))]
+    for label in labels:
+        slug = canonical_category(label)
+        conn.execute(
+            text("UPDATE articles SET category = :name, category_slug = :slug "
+                 "WHERE category_slug IS NULL AND category IS NOT DISTINCT FROM :label"
+                 if engine.dialect.name == "postgresql" else
+                 "UPDATE articles SET category = :name, category_slug = :slug "
+                 "WHERE category_slug IS NULL AND category IS :label"),
+            {"name": category_name(slug), "slug": slug, "label": label}
+        )
+    conn.commit()
+    print(f"Canonicalized {len(labels)} category labels.")
+
+def convert_embeddings(conn, batch_size=500):
+    """Move legacy JSON float lists into embedding_blob and clear the JSON copy."""
+    print(f"Converting JSON embeddings to {settings.EMBEDDING_STORAGE_DTYPE} blobs...")
+    update = text("UPDATE articles SET embedding_blob = :blob, embedding = NULL WHERE id = :id").bindparams(
+        bindparam("blob", type_=LargeBinary)
+    )
+    converted = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, embedding FROM articles "
+            "WHERE id > :last_id AND embedding IS NOT NULL AND embedding_blob IS NULL "
+            "ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": batch_size}).all()
+        if not rows:
+            break
+        params = []
+        for article_id, embedding in rows:
+            if isinstance(embedding, str):
+                embedding = json.loads(embedding)
+            if embedding:
+                params.append({"id": article_id, "blob": encode_embedding(embedding, settings.EMBEDDING_STORAGE_DTYPE)})
+        if params:
+            conn.execute(update, params)
+        conn.commit()
+        converted += len(params)
+        last_id = rows[-1][0]
+    print(f"Converted {converted} embeddings.")
+
+def backfill_simhashes(conn, batch_size=500):
+    """Fingerprint articles stored before the simhash column existed."""
+    print("Backfilling SimHash fingerprints...")
+    update = text("UPDATE articles SET simhash = :simhash WHERE id = :id")
+    filled = 0
+    last_id = 0
+    while True:
+        rows = conn.execute(text(
+            "SELECT id, title, content FROM articles "
+            "WHERE id > :last_id AND simhash IS NULL ORDER BY id LIMIT :limit"
+        ), {"last_id": last_id, "limit": batch_size}).all()
+        if not rows:
+            break
+        conn.execute(update, [
+            {"id": article_id, "simhash": to_signed(simhash(f"{title or ''}\n{content or ''}"))}
+            for article_id, title, content in rows
+        ])
+        conn.commit()
+        filled += len(rows)
+        last_id = rows[-1][0]
+    print(f"Fingerprinted {filled} articles.")
+
+def backfill_feed_scores(conn):
+    """Zero NULL feed scores on legacy rows; the feed's keyset cursors never match NULL."""
+    print("Backfilling feed scores...")
+    filled = conn.execute(text("UPDATE articles SET feed_score = 0.0 WHERE feed_score IS NULL")).rowcount
+    conn.commit()
+    print(f"Scored {filled} articles.")
 
 def migrate():
+    print("Creating missing tables...")
+    Base.metadata.create_all(bind=engine)
+
     with engine.connect() as conn:
-        print("Checking for column 'region' in 'articles'...")
-        try:
-            conn.execute(text("ALTER TABLE articles ADD COLUMN region VARCHAR"))
-            conn.commit()
-            print("Successfully added 'region' column.")
-        except Exception as e:
-            if "already exists" in str(e).lower():
-                print("Column 'region' already exists.")
-            else:
-                print(f"Migration error: {e}")
+        add_column(conn, "region", "VARCHAR")
+        add_column(conn, "category_slug", "VARCHAR")
+        add_column(conn, "embedding_blob", "BYTEA" if engine.dialect.name == "postgresql" else "BLOB")
+        add_column(conn, "simhash", "BIGINT")
+
+        timestamp = "TIMESTAMP WITH TIME ZONE" if engine.dialect.name == "postgresql" else "DATETIME"
+        for name, ddl_type in [
+            ("breaker_state", "VARCHAR DEFAULT 'closed'"), ("breaker_open_until", timestamp),
+            ("trips", "INTEGER DEFAULT 0"), ("consecutive_failures", "INTEGER DEFAULT 0"),
+            ("latency_ewma_ms", "FLOAT"), ("last_error_class", "VARCHAR"), ("error_counts", "JSON"),
+            ("requests", "INTEGER DEFAULT 0"), ("failures", "INTEGER DEFAULT 0"),
+            ("last_success_at", timestamp), ("last_failure_at", timestamp),
+        ]:
+            add_column(conn, name, ddl_type, table="crawl_hosts")
+
+        create_index(conn, "ix_articles_feed_order",
+                     "articles (feed_score DESC, publish_date DESC, id DESC)")
+        create_index(conn, "ix_articles_category_slug", "articles (category_slug)")
+        create_index(conn, "ix_articles_category_feed_order",
+                     "articles (category_slug, feed_score DESC, publish_date DESC, id DESC)")
+        create_index(conn, "ix_articles_category_recent", "articles (category_slug, publish_date DESC)")
+
+        backfill_category_slugs(conn)
+        backfill_feed_scores(conn)
+        convert_embeddings(conn)
+        backfill_simhashes(conn)
+
+    print("Ensuring full-text search index...")
+    if ensure_search_index(engine):
+        print("Search index ready.")
+    else:
+        print("Full-text search not supported on this database; search will use ILIKE.")
 
 if __name__ == "__main__":
     migrate()
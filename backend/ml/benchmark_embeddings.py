@@ -0,0 +1,61 @@
+"""
+Parity and throughput check: torch SentenceTransformer vs the int8 ONNX export.
+
+    python -m ml.benchmark_embeddings [n_texts]
+
+Run from backend/ after ml/export_onnx.py. Cosine similarity between the two
+backends' vectors should stay above ~0.98 for dedup decisions to agree.
+"""
+import os
+import sys
+import time
+
+import pandas as pd
+from sentence_transformers import SentenceTransformer
+
+from app.services.onnx_encoder import OnnxSentenceEncoder
+from ml.export_onnx import MODEL_NAME, OUTPUT_DIR
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "data", "sample_articles.csv")
+BATCH_SIZES = (1, 8, 32)
+
+
+def load_texts(n):
+    df = pd.read_csv(DATA_PATH)
+    texts = (df['title'].astype(str) + '\n' + df['content'].astype(str).str[:500]).tolist()
+    # Repeat the sample with a suffix so the benchmark has enough distinct inputs
+    return [f"{texts[i % len(texts)]} ({i})" for i in range(n)]
+
+
+def throughput(encode, texts, batch_size):
+    encode(texts[:batch_size], batch_size)  # warm-up
+    start = time.perf_counter()
+    encode(texts, batch_size)
+    return len(texts) / (time.perf_counter() - start)
+
+
+def main(n=256):
+    texts = load_texts(int(n))
+    torch_model = SentenceTransformer(MODEL_NAME, device='cpu')
+    onnx_model = OnnxSentenceEncoder(OUTPUT_DIR)
+
+    def encode_torch(batch, batch_size):
+        return torch_model.encode(batch, batch_size=batch_size, convert_to_numpy=True, normalize_embeddings=True)
+
+    def encode_onnx(batch, batch_size):
+        return onnx_model.encode(batch, batch_size=batch_size)
+
+    a = encode_torch(texts, 32)
+    b = encode_onnx(texts, 32)
+    assert a.shape == b.shape, f"shape mismatch: {a.shape} vs {b.shape}"
+    cos = (a * b).sum(axis=1)
+    print(f"Parity over {len(texts)} texts: dim={a.shape[1]} cosine min={cos.min():.4f} mean={cos.mean():.4f}")
+
+    for batch_size in BATCH_SIZES:
+        t = throughput(encode_torch, texts, batch_size)
+        o = throughput(encode_onnx, texts, batch_size)
+        print(f"batch={batch_size:>3}  torch {t:8.1f} texts/s  onnx-int8 {o:8.1f} texts/s  ({o / t:.2f}x)")
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:])
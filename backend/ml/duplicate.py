@@ -1,13 +1,176 @@
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+import hashlib
+import threading
+import time
+
 import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer
+
+# Stateless, so a text is tokenized once, when it enters the window; the IDF
+# is fitted separately on the window's term counts.
+N_FEATURES = 2 ** 18
+_hasher = HashingVectorizer(
+    stop_words='english', n_features=N_FEATURES, alternate_sign=False, norm=None
+)
+
+
+def _counts(texts):
+    return _hasher.transform(texts).tocsr().astype(np.float64)
+
+
+def text_key(text):
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class IncrementalDuplicateChecker:
+    """
+    Sliding-window TF-IDF duplicate checker.
+
+    Keeps the term counts of recently seen texts as one sparse matrix, an IDF
+    fitted on that window and the window's L2-normalised TF-IDF rows. A check
+    hashes only the new text, weights it with the cached IDF and takes one
+    sparse dot product. Added texts wait in a buffer (weighted with the
+    current IDF) until they are merged and the IDF is refitted from the
+    cached counts, which happens once the buffer reaches merge_every or the
+    size of the window. Rows not seen for max_age_seconds (then the oldest
+    beyond max_items) are evicted on merge.
+    """
+
+    def __init__(self, threshold=0.9, max_age_seconds=48 * 3600, max_items=None, merge_every=64):
+        self.threshold = threshold
+        self.max_age_seconds = max_age_seconds
+        self.max_items = max_items
+        self.merge_every = merge_every
+        self.lock = threading.RLock()
+        self.idf = None
+        self.counts = sp.csr_matrix((0, N_FEATURES), dtype=np.float64)
+        self.matrix = sp.csr_matrix((0, N_FEATURES), dtype=np.float64)
+        self.keys = []
+        self.positions = {}  # key -> row, merged and pending
+        self.last_seen = {}  # key -> timestamp
+        self.pending_counts = []
+        self.pending_rows = []
+        self.pending_keys = []
+
+    def __len__(self):
+        return len(self.keys) + len(self.pending_keys)
+
+    def __contains__(self, key):
+        return key in self.positions
+
+    def _weigh(self, counts):
+        return self.idf.transform(counts) if self.idf is not None else counts
+
+    def _merge(self, now=None):
+        """Fold pending rows in, evict old rows and refit the IDF on what remains."""
+        counts = sp.vstack([self.counts] + self.pending_counts, format='csr')
+        keys = self.keys + self.pending_keys
+        self.pending_counts, self.pending_rows, self.pending_keys = [], [], []
+
+        now = time.time() if now is None else now
+        stamps = np.array([self.last_seen[k] for k in keys], dtype=np.float64)
+        keep = stamps >= now - self.max_age_seconds
+        if self.max_items is not None and keep.sum() > self.max_items:
+            kept = np.flatnonzero(keep)
+            newest = kept[np.argsort(stamps[kept], kind='stable')[-self.max_items:]]
+            keep = np.zeros_like(keep)
+            keep[newest] = True
+        if not keep.all():
+            counts = counts[np.flatnonzero(keep)]
+            for key, kept in zip(keys, keep):
+                if not kept:
+                    self.last_seen.pop(key, None)
+            keys = [k for k, kept in zip(keys, keep) if kept]
+
+        self.counts, self.keys = counts, keys
+        self.positions = {key: i for i, key in enumerate(keys)}
+        if keys:
+            self.idf = TfidfTransformer().fit(counts)
+            self.matrix = self.idf.transform(counts).tocsr()
+        else:
+            self.idf = None
+            self.matrix = sp.csr_matrix((0, N_FEATURES), dtype=np.float64)
+
+    def evict(self, now=None):
+        """Drop rows not seen for max_age_seconds, then the oldest beyond max_items. Returns how many."""
+        with self.lock:
+            before = len(self)
+            self._merge(now)
+            return before - len(self)
+
+    def _add_counts(self, counts, key, timestamp):
+        self.last_seen[key] = time.time() if timestamp is None else timestamp
+        if key in self.positions:
+            return
+        self.positions[key] = len(self)
+        self.pending_counts.append(counts)
+        self.pending_rows.append(self._weigh(counts))
+        self.pending_keys.append(key)
+        if len(self.pending_keys) >= min(self.merge_every, max(1, len(self.keys))):
+            self._merge()
+
+    def add(self, text, key=None, timestamp=None):
+        with self.lock:
+            key = text_key(text) if key is None else key
+            if key in self.positions:
+                self.last_seen[key] = time.time() if timestamp is None else timestamp
+            else:
+                self._add_counts(_counts([text]), key, timestamp)
+
+    def ensure(self, texts):
+        """Add any of `texts` not yet in the window and mark them seen. Returns their keys."""
+        keys = []
+        with self.lock:
+            now = time.time()
+            for text in texts:
+                key = text_key(text)
+                keys.append(key)
+                if key in self.positions:
+                    self.last_seen[key] = now
+                else:
+                    self._add_counts(_counts([text]), key, now)
+        return keys
+
+    def _similarities(self, counts, keys=None):
+        query = self._weigh(counts)
+        sims = [self.matrix.dot(query.T).toarray().ravel()]
+        sims.extend(row.dot(query.T).toarray().ravel() for row in self.pending_rows)
+        sims = np.concatenate(sims)
+        if keys is not None:
+            sims = sims[[self.positions[k] for k in keys if k in self.positions]]
+        return sims
+
+    def max_similarity(self, text, keys=None):
+        """Highest cosine of `text` against the window, or against just the rows of `keys`."""
+        with self.lock:
+            sims = self._similarities(_counts([text]), keys)
+        return float(sims.max()) if sims.size else 0.0
+
+    def is_duplicate(self, text):
+        return self.max_similarity(text) >= self.threshold
+
+    def check_and_add(self, text, key=None, timestamp=None):
+        """Check `text` against the window and store it if it is new. Returns True for a duplicate."""
+        counts = _counts([text])
+        with self.lock:
+            sims = self._similarities(counts)
+            if sims.size and float(sims.max()) >= self.threshold:
+                return True
+            self._add_counts(counts, text_key(text) if key is None else key, timestamp)
+        return False
+
+
+# Singleton instance
+duplicate_checker = IncrementalDuplicateChecker()
+
 
 def is_duplicate(new_text, existing_texts, threshold=0.9):
+    """
+    TF-IDF cosine of `new_text` against `existing_texts` reaches `threshold`.
+    The existing texts are vectorized once, into the shared window, so
+    repeated checks against the same corpus only transform `new_text`.
+    """
     if not existing_texts:
         return False
-    texts = existing_texts + [new_text]
-    vect = TfidfVectorizer(stop_words='english', max_features=2000)
-    X = vect.fit_transform(texts)
-    sims = cosine_similarity(X[-1], X[:-1])
-    max_sim = np.max(sims)
-    return float(max_sim) >= threshold
+    keys = duplicate_checker.ensure(existing_texts)
+    return duplicate_checker.max_similarity(new_text, keys) >= threshold
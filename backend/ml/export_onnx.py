@@ -0,0 +1,51 @@
+import os
+import sys
+
+import torch
+from transformers import AutoModel, AutoTokenizer
+from onnxruntime.quantization import QuantType, quantize_dynamic
+
+MODEL_NAME = os.getenv('SENTENCE_TRANSFORMER_MODEL', 'all-MiniLM-L6-v2')
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "models", "minilm-onnx")
+
+
+class TokenEmbeddings(torch.nn.Module):
+    """Wraps the transformer so the graph returns only last_hidden_state; pooling happens in onnx_encoder."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, input_ids, attention_mask, token_type_ids):
+        return self.model(input_ids=input_ids, attention_mask=attention_mask, token_type_ids=token_type_ids)[0]
+
+
+def export(model_name=MODEL_NAME, output_dir=OUTPUT_DIR):
+    repo = model_name if '/' in model_name else f'sentence-transformers/{model_name}'
+    tokenizer = AutoTokenizer.from_pretrained(repo)
+    model = TokenEmbeddings(AutoModel.from_pretrained(repo)).eval()
+
+    os.makedirs(output_dir, exist_ok=True)
+    fp32_path = os.path.join(output_dir, 'model.onnx')
+    int8_path = os.path.join(output_dir, 'model_int8.onnx')
+
+    sample = tokenizer(['export sample sentence'], return_tensors='pt')
+    dynamic = {0: 'batch', 1: 'sequence'}
+    torch.onnx.export(
+        model,
+        (sample['input_ids'], sample['attention_mask'], sample['token_type_ids']),
+        fp32_path,
+        input_names=['input_ids', 'attention_mask', 'token_type_ids'],
+        output_names=['last_hidden_state'],
+        dynamic_axes={'input_ids': dynamic, 'attention_mask': dynamic, 'token_type_ids': dynamic,
+                      'last_hidden_state': dynamic},
+        opset_version=14,
+    )
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    tokenizer.save_pretrained(output_dir)  # writes tokenizer.json for the tokenizers runtime
+    print('Saved ONNX model to', fp32_path)
+    print('Saved int8 ONNX model to', int8_path)
+
+
+if __name__ == '__main__':
+    export(*sys.argv[1:])
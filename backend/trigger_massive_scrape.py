@@ -1,7 +1,7 @@
 import logging
 import asyncio
 from app.services.scraper_v2 import SCRAPER_CONFIG
-from app.services.pipeline_v2 import run_premium_source_scrape
+from app.services.pipeline_v2 import scrape_sources
 from app.db.session import engine, Base
 from app.models.article import Article
 
@@ -14,16 +14,11 @@ async def main():
     # Ensure tables are ready
     Base.metadata.create_all(bind=engine)
     
-    total_new = 0
-    # Run through all verified sources
-    for config in SCRAPER_CONFIG:
-        logger.info(f"--- Scraping {config['name']} ---")
-        try:
-            new_count = run_premium_source_scrape(config)
-            total_new += new_count
-            logger.info(f"Added {new_count} new articles from {config['name']}")
-        except Exception as e:
-            logger.error(f"Failed source {config['name']}: {e}")
+    # Run through all verified sources concurrently
+    added = await scrape_sources(SCRAPER_CONFIG)
+    for name, new_count in added.items():
+        logger.info(f"Added {new_count} new articles from {name}")
+    total_new = sum(added.values())
             
     logger.info(f"Injection Complete. Total High-Quality Articles Added: {total_new}")
 
@@ -21,7 +21,7 @@ export default function SearchBar() {
     const [query, setQuery] = useState('');
     const [results, setResults] = useState<SearchResult[]>([]);
     const [isLoading, setIsLoading] = useState(false);
-    const [totalResults, setTotalResults] = useState(0);
+    const [hasMore, setHasMore] = useState(false);
     const [selectedIndex, setSelectedIndex] = useState(-1);
     const [recentSearches, setRecentSearches] = useState<string[]>([]);
     const searchRef = useRef<HTMLDivElement>(null);
@@ -55,12 +55,13 @@ export default function SearchBar() {
             try {
                 const url = new URL(API_ENDPOINTS.SEARCH);
                 url.searchParams.append('q', query);
+                // No include_total: an exact count per keystroke is too costly, has_more is enough
                 url.searchParams.append('limit', '10');
 
                 const res = await fetch(url.toString());
                 const data = await res.json();
                 setResults(data.results || []);
-                setTotalResults(data.total || 0);
+                setHasMore(Boolean(data.has_more));
             } catch (error) {
                 console.error('Search error:', error);
                 setResults([]);
@@ -192,7 +193,7 @@ export default function SearchBar() {
                                         <>
                                             <div className="flex items-center justify-between mb-6 pb-3 border-b-2 border-black">
                                                 <div className="text-sm font-black uppercase tracking-widest">
-                                                    <span className="text-accent">{totalResults}</span> Result{totalResults !== 1 ? 's' : ''} Found
+                                                    <span className="text-accent">{results.length}{hasMore ? '+' : ''}</span> Result{results.length !== 1 || hasMore ? 's' : ''} Found
                                                 </div>
                                                 <div className="text-xs text-secondary">
                                                     Use ↑↓ arrows to navigate, Enter to open